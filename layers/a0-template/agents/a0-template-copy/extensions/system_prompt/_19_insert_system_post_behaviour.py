@@ -1 +0,0 @@
-/a0/control_layer/agents/_symlink/extensions/system_prompt/_19_insert_system_post_behaviour.py
\ No newline at end of file
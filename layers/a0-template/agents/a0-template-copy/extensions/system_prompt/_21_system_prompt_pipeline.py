@@ -0,0 +1 @@
+/a0/control_layer/agents/_symlink/extensions/system_prompt/_21_system_prompt_pipeline.py
\ No newline at end of file
@@ -1 +0,0 @@
-/a0/control_layer/agents/_symlink/extensions/system_prompt/_99_append_tbc_system_ready.py
\ No newline at end of file
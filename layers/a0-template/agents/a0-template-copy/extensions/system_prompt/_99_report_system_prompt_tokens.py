@@ -0,0 +1 @@
+/a0/control_layer/agents/_symlink/extensions/system_prompt/_99_report_system_prompt_tokens.py
\ No newline at end of file
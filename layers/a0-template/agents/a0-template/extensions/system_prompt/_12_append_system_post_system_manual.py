@@ -1 +0,0 @@
-/a0/control_layer/agents/_symlink/extensions/system_prompt/_12_append_system_post_system_manual.py
\ No newline at end of file
@@ -1 +0,0 @@
-/a0/control_layer/agents/_symlink/extensions/system_prompt/_21_insert_system_pre_behaviour.py
\ No newline at end of file
@@ -0,0 +1 @@
+/a0/control_layer/agents/_symlink/extensions/system_prompt/_99_order_system_prompt_segments.py
\ No newline at end of file
@@ -0,0 +1 @@
+/a0/control_layer/agents/_symlink/tools/preset_control.py
\ No newline at end of file
@@ -4,6 +4,7 @@ import base64
 import io
 import warnings
 import asyncio
+import threading
 import numpy as np
 import soundfile as sf
 from python.helpers import runtime
@@ -17,6 +18,8 @@ _pipeline = None
 _voice = "am_puck,am_onyx"
 _speed = 1.1
 is_updating_model = False
+# The pipeline is not thread-safe: concurrent syntheses take turns per step
+_pipeline_lock = threading.Lock()
 
 
 async def preload():
@@ -99,10 +102,33 @@ async def synthesize_sentences(sentences: list[str]):
         # return await _synthesize_sentences(sentences)
 
 
+async def synthesize_stream(sentences: list[str]):
+    """Generate audio per sentence segment and yield each as base64 WAV as soon as it is ready"""
+    # Async generators cannot be routed through runtime.call_development_function
+    async for audio_base64 in _synthesize_stream(sentences):
+        yield audio_base64
+
+
+async def _synthesize_stream(sentences: list[str]):
+    async for audio_numpy in _synthesize_chunks(sentences):
+        yield _encode_wav(audio_numpy)
+
+
 async def _synthesize_sentences(sentences: list[str]):
+    audio_chunks = [audio_numpy async for audio_numpy in _synthesize_chunks(sentences)]
+
+    if not audio_chunks:
+        return ""
+
+    combined_audio = np.concatenate(audio_chunks)
+    return _encode_wav(combined_audio)
+
+
+async def _synthesize_chunks(sentences: list[str]):
+    """Yield the audio of each pipeline segment as a numpy array, in order"""
     await _preload()
 
-    audio_chunks = []
+    produced = False
 
     try:
         for sentence in sentences:
@@ -111,24 +137,33 @@ async def _synthesize_sentences(sentences: list[str]):
 
             segments = _pipeline(sentence.strip(), voice=_voice, speed=_speed)  # type: ignore
 
-            for segment in segments:
+            while True:
+                # Run each synthesis step off the event loop so other coroutines keep running
+                segment = await asyncio.to_thread(_next_segment, segments)
+                if segment is None:
+                    break
                 audio_tensor = segment.audio
                 audio_numpy = audio_tensor.detach().cpu().numpy()  # type: ignore
-                audio_chunks.append(audio_numpy)
                 del segment  # free tensor promptly
+                produced = True
+                yield audio_numpy
 
-        if not audio_chunks:
+        if not produced:
             PrintStyle.warning("Kokoro TTS: no audio generated (all sentences empty).")
-            return ""
 
-        combined_audio = np.concatenate(audio_chunks)
+    except Exception as e:
+        PrintStyle.error(f"Error in Kokoro TTS synthesis: {e}")
+        raise
 
-        buffer = io.BytesIO()
-        sf.write(buffer, combined_audio, 24000, format="WAV")
-        audio_bytes = buffer.getvalue()
 
-        return base64.b64encode(audio_bytes).decode("utf-8")
+def _next_segment(segments):
+    with _pipeline_lock:
+        return next(segments, None)
 
-    except Exception as e:
-        PrintStyle.error(f"Error in Kokoro TTS synthesis: {e}")
-        raise    
\ No newline at end of file
+
+def _encode_wav(audio_numpy) -> str:
+    buffer = io.BytesIO()
+    sf.write(buffer, audio_numpy, 24000, format="WAV")
+    audio_bytes = buffer.getvalue()
+
+    return base64.b64encode(audio_bytes).decode("utf-8")
@@ -1 +0,0 @@
-ln -sf /a0/control_layer/agents/_symlink/extensions/system_prompt/_11_insert_system_pre_system_manual.py _11_insert_system_pre_system_manual.py && echo "✓ Created symlink to common file _11_insert_system_pre_system_manual.py"
@@ -1 +0,0 @@
-ln -sf /a0/control_layer/agents/_symlink/extensions/system_prompt/_12_append_system_post_system_manual.py _12_append_system_post_system_manual.py && echo "✓ Created symlink to common file _12_append_system_post_system_manual.py"
@@ -0,0 +1,12 @@
+import asyncio
+from python.helpers.extension import Extension
+from agent import LoopData
+from control_layer.python.helpers import system_prompt_pipeline
+
+
+class SystemPromptPipeline(Extension):
+
+    async def execute(self, system_prompt: list[str]=[], loop_data: LoopData = LoopData(), **kwargs):
+        # Insert every control layer segment listed in prompts/system_prompt_pipeline.json in one pass;
+        # prompt files and config are read in a worker thread so the event loop is not blocked
+        await asyncio.to_thread(system_prompt_pipeline.run_pipeline, self.agent, system_prompt)
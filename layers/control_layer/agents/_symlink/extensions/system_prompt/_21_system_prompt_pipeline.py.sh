@@ -0,0 +1 @@
+ln -sf /a0/control_layer/agents/_symlink/extensions/system_prompt/_21_system_prompt_pipeline.py _21_system_prompt_pipeline.py && echo "✓ Created symlink to common file _21_system_prompt_pipeline.py"
@@ -1 +0,0 @@
-ln -sf /a0/control_layer/agents/_symlink/extensions/system_prompt/_95_insert_system_model_godmode.py _95_insert_system_model_godmode.py && echo "✓ Created symlink to common file _95_insert_system_model_godmode.py"
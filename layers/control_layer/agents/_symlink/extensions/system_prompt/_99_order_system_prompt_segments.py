@@ -0,0 +1,10 @@
+from python.helpers.extension import Extension
+from agent import LoopData
+from control_layer.python.helpers import prompt_order
+
+
+class OrderPromptSegments(Extension):
+
+    async def execute(self, system_prompt: list[str]=[], loop_data: LoopData = LoopData(), **kwargs):
+        # Stable segments first so the provider-cached prompt prefix survives profile changes
+        prompt_order.order_segments(self.agent, system_prompt)
@@ -0,0 +1 @@
+ln -sf /a0/control_layer/agents/_symlink/extensions/system_prompt/_99_order_system_prompt_segments.py _99_order_system_prompt_segments.py && echo "✓ Created symlink to common file _99_order_system_prompt_segments.py"
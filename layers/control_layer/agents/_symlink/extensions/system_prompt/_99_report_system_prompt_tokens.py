@@ -0,0 +1,12 @@
+from python.helpers.extension import Extension
+from agent import LoopData
+from control_layer.python.helpers import prompt_budget
+from control_layer.python.helpers.system_control import get_async_system_control
+
+
+class ReportPromptTokens(Extension):
+
+    async def execute(self, system_prompt: list[str]=[], loop_data: LoopData = LoopData(), **kwargs):
+        # Runs last: enforce the total prompt budget and store the per-segment token report
+        snapshot = await get_async_system_control().snapshot()
+        prompt_budget.finalize_report(self.agent, system_prompt, snapshot)
@@ -0,0 +1 @@
+ln -sf /a0/control_layer/agents/_symlink/extensions/system_prompt/_99_report_system_prompt_tokens.py _99_report_system_prompt_tokens.py && echo "✓ Created symlink to common file _99_report_system_prompt_tokens.py"
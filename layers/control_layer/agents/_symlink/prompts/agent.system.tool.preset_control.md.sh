@@ -0,0 +1 @@
+ln -sf /a0/control_layer/agents/_symlink/prompts/agent.system.tool.preset_control.md agent.system.tool.preset_control.md && echo "✓ Created symlink to common file agent.system.tool.preset_control.md"
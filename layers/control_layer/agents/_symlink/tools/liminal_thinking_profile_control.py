@@ -1,5 +1,5 @@
 from python.helpers.tool import Tool, Response
-from control_layer.python.helpers.system_control import SystemControl
+from control_layer.python.helpers.system_control import get_async_system_control
 
 
 profile_module_name = "liminal_thinking_profile"
@@ -22,10 +22,10 @@ class ProfileControlTool(Tool):
         - get_profile: View active profile
         - set_profile: Change active profile (requires: profile="name")
         """
-        system = SystemControl()
+        system = get_async_system_control()
 
         if action in ("get_state", "get_profile", "set_profile"):
-            result = system.run_profile_control(
+            result = await system.run_profile_control(
                 profile_module_name=profile_module_name,
                 profile_module_control_key=profile_module_control_key,
                 profile_module_display_name=profile_module_display_name,
@@ -1,5 +1,5 @@
 from python.helpers.tool import Tool, Response
-from control_layer.python.helpers.system_control import SystemControl
+from control_layer.python.helpers.system_control import get_async_system_control
 
 
 profile_module_name = "philosophy_profile"
@@ -23,20 +23,22 @@ class ProfileControlTool(Tool):
         - set_profile: Change active profile (requires: profile="name")
         """
         
-        system = SystemControl()
+        system = get_async_system_control()
+        snapshot = await system.snapshot()
         
         # Check if tool itself is enabled
-        if not system.is_control_enabled(profile_module_control_key):
+        if not await system.is_control_enabled(profile_module_control_key, snapshot):
             return Response(
                 message=f"{profile_module_display_name} control tool is disabled by current security profile. Admin override required.",
                 break_loop=False
             )
         
-        result = system.run_profile_control(
+        result = await system.run_profile_control(
             profile_module_name=profile_module_name,
             profile_module_control_key=profile_module_control_key,
             profile_module_display_name=profile_module_display_name,
             action=action,
+            snapshot=snapshot,
             **kwargs,
         )
 
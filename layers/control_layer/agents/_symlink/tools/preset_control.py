@@ -0,0 +1,143 @@
+from python.helpers.tool import Tool, Response
+from control_layer.python.helpers.system_control import AsyncSystemControl, ConfigSnapshot, get_async_system_control
+
+
+tool_key = "preset_control"
+tool_display_name = "Preset control tool"
+
+
+class PresetControlTool(Tool):
+    """
+    Tool for switching SystemControl presets.
+    A preset bundles security, profile module and prompt-include settings that are applied in one write.
+    """
+
+    async def execute(self, action: str = "", **kwargs):
+        """
+        Execute preset control action.
+
+        Actions:
+        - get_all: List presets with their descriptions
+        - get_preset: View the settings of a preset (requires: preset="name")
+        - apply_preset: Apply all settings of a preset at once (requires: preset="name")
+        """
+
+        system = get_async_system_control()
+        snapshot = await system.snapshot()
+
+        # Check if tool itself is enabled
+        if not await system.is_control_enabled(tool_key, snapshot):
+            return Response(
+                message=f"{tool_display_name} is disabled by current security profile. Admin override required.",
+                break_loop=False,
+            )
+
+        if action == "get_all":
+            return await self._get_all(system, snapshot)
+        elif action == "get_preset":
+            return await self._get_preset(system, snapshot, kwargs)
+        elif action == "apply_preset":
+            return await self._apply_preset(system, snapshot, kwargs)
+        else:
+            return Response(
+                message=f"Unknown action '{action}'. Available: get_all, get_preset, apply_preset",
+                break_loop=False,
+            )
+
+    async def _get_all(self, system: AsyncSystemControl, snapshot: ConfigSnapshot) -> Response:
+        """List all presets with description and validity"""
+        presets = await system.get_presets(snapshot)
+
+        lines = [
+            "=== Presets (SystemControl) ===",
+            f"Total presets: {len(presets)}",
+            "",
+        ]
+
+        for name in sorted(presets):
+            preset = presets[name]
+            status = "INVALID" if preset["errors"] else f"{len(preset['changes'])} settings"
+            description = f" - {preset['description']}" if preset["description"] else ""
+            lines.append(f"  - {name} ({status}){description}")
+
+        if not presets:
+            lines.append("  - (No presets defined in system_control.json)")
+
+        lines.append("")
+        lines.append("Use action='get_preset' with preset=\"name\" to see its settings.")
+
+        return Response(message="\n".join(lines), break_loop=False)
+
+    async def _get_preset(self, system: AsyncSystemControl, snapshot: ConfigSnapshot, kwargs: dict) -> Response:
+        """Show the settings of one preset"""
+        name = kwargs.get("preset", "")
+        presets = await system.get_presets(snapshot)
+
+        if name not in presets:
+            return Response(
+                message=f"Preset '{name}' not found. Available presets: {', '.join(sorted(presets))}",
+                break_loop=False,
+            )
+
+        preset = presets[name]
+        lines = [f"Preset: {name}"]
+        if preset["description"]:
+            lines.append(f"Description: {preset['description']}")
+        lines.append("")
+        lines.append("Settings:")
+        for change in preset["changes"]:
+            lines.append(f"  - {self._format_change(change)}")
+        for error in preset["errors"]:
+            lines.append(f"  ⚠ {error}")
+
+        return Response(message="\n".join(lines), break_loop=False)
+
+    async def _apply_preset(self, system: AsyncSystemControl, snapshot: ConfigSnapshot, kwargs: dict) -> Response:
+        """Apply every setting of a preset in one write"""
+        name = kwargs.get("preset", "")
+
+        if not name:
+            presets = await system.get_presets(snapshot)
+            return Response(
+                message=f"Missing 'preset' parameter. Available presets: {', '.join(sorted(presets))}",
+                break_loop=False,
+            )
+
+        result = await system.apply_preset(name)
+
+        if not result.get("success", False):
+            lines = [f"Failed to apply preset '{name}': {result.get('error') or result.get('message', 'Unknown error')}"]
+            available = result.get("available_presets", [])
+            if available:
+                lines.append(f"Available presets: {', '.join(available)}")
+            for item in result.get("results", []):
+                if not item.get("success", False):
+                    lines.append(f"  - {self._format_target(item)}: {item.get('error', 'Unknown error')}")
+            return Response(message="\n".join(lines), break_loop=False)
+
+        lines = [
+            f"✓ Preset '{name}' applied: {result.get('message', '')}",
+            "",
+        ]
+        for item in result.get("results", []):
+            if "previous_profile" in item:
+                lines.append(f"  - {item['profile_module']}: {item['previous_profile']} → {item['new_profile']}")
+            elif "profile_module" in item:
+                lines.append(f"  - {item['profile_module']}: unchanged ({item.get('profile', '')})")
+            else:
+                status = "ENABLED" if item.get("new_value") else "DISABLED"
+                unchanged = "" if item.get("previous_value") != item.get("new_value") else " (unchanged)"
+                lines.append(f"  - {item['prompt_include']}: {status}{unchanged}")
+
+        lines.append("")
+        lines.append("Changes take effect on the next message loop.")
+
+        return Response(message="\n".join(lines), break_loop=False)
+
+    def _format_change(self, change: dict) -> str:
+        if "profile_module" in change:
+            return f"{change['profile_module']}: {change['profile']}"
+        return f"{change['prompt_include']}: {'enabled' if change['enabled'] else 'disabled'}"
+
+    def _format_target(self, item: dict) -> str:
+        return item.get("profile_module") or item.get("prompt_include") or "change"
@@ -0,0 +1 @@
+ln -sf /a0/control_layer/agents/_symlink/tools/preset_control.py preset_control.py && echo "✓ Created symlink to common file preset_control.py"
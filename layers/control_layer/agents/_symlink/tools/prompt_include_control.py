@@ -1,5 +1,5 @@
 from python.helpers.tool import Tool, Response
-from control_layer.python.helpers.system_control import SystemControl
+from control_layer.python.helpers.system_control import AsyncSystemControl, ConfigSnapshot, get_async_system_control
 
 
 tool_key = "prompt_include_control"
@@ -8,19 +8,20 @@ tool_display_name = "Prompt include control tool"
 
 class PromptIncludeControlTool(Tool):
     async def execute(self, action: str = "", **kwargs):
-        system = SystemControl()
+        system = get_async_system_control()
+        snapshot = await system.snapshot()
 
         # Check if tool itself is enabled via SystemControl
-        if not system.is_prompt_include_enabled(tool_key):
+        if not await system.is_prompt_include_enabled(tool_key, snapshot):
             return Response(
                 message=f"{tool_display_name} is disabled by current security profile. Admin override required.",
                 break_loop=False,
             )
 
         if action == "get_all":
-            return await self._get_all(system)
+            return await self._get_all(system, snapshot)
         elif action == "get_entry":
-            return await self._get_entry(system, kwargs)
+            return await self._get_entry(system, snapshot, kwargs)
         elif action == "set_entry":
             return await self._set_entry(system, kwargs)
         else:
@@ -29,10 +30,10 @@ class PromptIncludeControlTool(Tool):
                 break_loop=False,
             )
 
-    async def _get_all(self, system: SystemControl) -> Response:
+    async def _get_all(self, system: AsyncSystemControl, snapshot: ConfigSnapshot) -> Response:
         """List all prompt-includes and System Control tools with effective status and source."""
-        available = system.get_available_prompt_includes_and_controls()
-        state = system.get_security_state()
+        available = await system.get_available_prompt_includes_and_controls(snapshot)
+        state = await system.get_security_state(snapshot)
 
         lines = [
             "=== Prompt Include Status (SystemControl) ===",
@@ -41,7 +42,7 @@ class PromptIncludeControlTool(Tool):
         ]
 
         for name in sorted(available):
-            is_enabled = system.is_prompt_include_enabled(name)
+            is_enabled = await system.is_prompt_include_enabled(name, snapshot)
             entry_state = state["entries"].get(name, {})
             source = entry_state.get("source", "not_found")
             status = "ENABLED" if is_enabled else "disabled"
@@ -63,12 +64,12 @@ class PromptIncludeControlTool(Tool):
 
         return Response(message=message, break_loop=False)
 
-    async def _get_entry(self, system: SystemControl, kwargs: dict) -> Response:
+    async def _get_entry(self, system: AsyncSystemControl, snapshot: ConfigSnapshot, kwargs: dict) -> Response:
         entry = kwargs.get("entry", "")
 
         if not entry:
             # Show all prompt-includes and System Control tools
-            state = system.get_security_state()
+            state = await system.get_security_state(snapshot)
             lines = ["System prompt-includes/System Control tools:"]
             for name, info in state["entries"].items():
                 enabled = info.get("enabled", False)
@@ -78,18 +79,15 @@ class PromptIncludeControlTool(Tool):
             return Response(message="\n".join(lines), break_loop=False)
 
         # Show specific prompt-include or System Control tool
-        available = system.get_available_prompt_includes_and_controls()
+        available = await system.get_available_prompt_includes_and_controls(snapshot)
         if entry not in available:
             return Response(
                 message=f"Entry '{entry}' (prompt-include/System Control tool) not found. Available: {', '.join(available)}",
                 break_loop=False,
             )
 
-        is_enabled = system.is_prompt_include_enabled(entry)
-        config = system.get_prompt_include_config(entry)
-
-        state = system.get_security_state()
-        source = state["entries"].get(entry, {}).get("source", "not_found")
+        is_enabled, source = snapshot.get_entry_enabled_and_source(entry)
+        config = await system.get_prompt_include_config(entry, snapshot)
 
         lines = [
             f"Entry: {entry}",
@@ -100,12 +98,12 @@ class PromptIncludeControlTool(Tool):
 
         return Response(message="\n".join(lines), break_loop=False)
 
-    async def _set_entry(self, system: SystemControl, kwargs: dict) -> Response:
+    async def _set_entry(self, system: AsyncSystemControl, kwargs: dict) -> Response:
         entry = kwargs.get("entry", "")
         enabled_str = kwargs.get("enabled", "")
 
         if not entry:
-            available = system.get_available_prompt_includes_and_controls()
+            available = await system.get_available_prompt_includes_and_controls()
             return Response(
                 message=f"Missing 'entry' parameter. Available prompt-includes/system control tools: {', '.join(available)}",
                 break_loop=False,
@@ -132,7 +130,7 @@ class PromptIncludeControlTool(Tool):
                     break_loop=False,
                 )
 
-        result = system.set_prompt_include_option(entry, enabled)
+        result = await system.set_prompt_include_option(entry, enabled)
 
         if not result.get("success", False):
             error = result.get("error", "Unknown error")
@@ -149,7 +147,7 @@ class PromptIncludeControlTool(Tool):
             lines.append(f"Note: {result['note']}")
             lines.append("")
 
-        is_actually_enabled = system.is_prompt_include_enabled(entry)
+        is_actually_enabled = await system.is_prompt_include_enabled(entry)
         if is_actually_enabled != enabled:
             lines.append(
                 f"⚠ Entry is currently {'ENABLED' if is_actually_enabled else 'DISABLED'} due to active security profile override",
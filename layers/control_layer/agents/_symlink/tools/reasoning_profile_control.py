@@ -1,5 +1,5 @@
 from python.helpers.tool import Tool, Response
-from control_layer.python.helpers.system_control import SystemControl
+from control_layer.python.helpers.system_control import AsyncSystemControl, ConfigSnapshot, get_async_system_control
 
 
 profile_module_control_key = "reasoning_profile_control"
@@ -31,10 +31,11 @@ class ProfileControlTool(Tool):
         - set_profile: Change profile for a specific type (requires: profile="name")
         """
         
-        system = SystemControl()
+        system = get_async_system_control()
+        snapshot = await system.snapshot()
         
         # Check if tool itself is enabled
-        if not system.is_control_enabled(profile_module_control_key):
+        if not await system.is_control_enabled(profile_module_control_key, snapshot):
             return Response(
                 message=f"{profile_module_display_name} control tool is disabled by current security profile. Admin override required.",
                 break_loop=False
@@ -42,11 +43,11 @@ class ProfileControlTool(Tool):
         
         # Route to action handlers
         if action == "get_all":
-            return await self._get_all(system)
+            return await self._get_all(system, snapshot)
         elif action == "get_state":
-            return await self._get_status(system, reasoning_type)
+            return await self._get_status(system, snapshot, reasoning_type)
         elif action == "get_profile":
-            return await self._get_profile(system, reasoning_type)
+            return await self._get_profile(system, snapshot, reasoning_type)
         elif action == "set_profile":
             return await self._set_profile(system, reasoning_type, kwargs)
         else:
@@ -55,24 +56,18 @@ class ProfileControlTool(Tool):
                 break_loop=False
             )
     
-    async def _get_all(self, system: SystemControl) -> Response:
+    async def _get_all(self, system: AsyncSystemControl, snapshot: ConfigSnapshot) -> Response:
         """Get all reasoning types and their active profiles"""
         lines = [
             "=== All Reasoning Profiles ===",
             ""
         ]
         
-        # Internal reasoning
-        internal_profile = system.get_active_profile(reasoning_type_module_names["internal"])
-        lines.append(f"Internal Reasoning: {internal_profile}")
-        
-        # Interleaved reasoning
-        interleaved_profile = system.get_active_profile(reasoning_type_module_names["interleaved"])
-        lines.append(f"Interleaved Reasoning: {interleaved_profile}")
-        
-        # External reasoning
-        external_profile = system.get_active_profile(reasoning_type_module_names["external"])
-        lines.append(f"External Reasoning: {external_profile}")
+        # Internal, interleaved and external reasoning, resolved together
+        active_profiles = await system.get_active_profiles(reasoning_type_module_names.values(), snapshot)
+        for reasoning_type in self.reasoning_types:
+            active_profile = active_profiles[reasoning_type_module_names[reasoning_type]]
+            lines.append(f"{reasoning_type.title()} Reasoning: {active_profile}")
         
         lines.append("")
         lines.append("Use action='get_state' with a specific reasoning_type to see available profiles.")
@@ -82,7 +77,7 @@ class ProfileControlTool(Tool):
             break_loop=False
         )
     
-    async def _get_status(self, system: SystemControl, reasoning_type: str) -> Response:
+    async def _get_status(self, system: AsyncSystemControl, snapshot: ConfigSnapshot, reasoning_type: str) -> Response:
         """Get full reasoning state for a specific type (profile and prompt includes)"""
         if not reasoning_type:
             return Response(
@@ -101,11 +96,12 @@ class ProfileControlTool(Tool):
         profile_module_name = reasoning_type_module_names[reasoning_type]
         display_name = f"{reasoning_type.title()} Reasoning Profile"
 
-        result = system.run_profile_control(
+        result = await system.run_profile_control(
             profile_module_name=profile_module_name,
             profile_module_control_key=profile_module_control_key,
             profile_module_display_name=display_name,
             action="get_state",
+            snapshot=snapshot,
         )
 
         message = result.get("message", "")
@@ -121,7 +117,7 @@ class ProfileControlTool(Tool):
             break_loop=result.get("break_loop", False),
         )
     
-    async def _get_profile(self, system: SystemControl, reasoning_type: str) -> Response:
+    async def _get_profile(self, system: AsyncSystemControl, snapshot: ConfigSnapshot, reasoning_type: str) -> Response:
         """Get active profile for a specific reasoning type"""
         if not reasoning_type:
             return Response(
@@ -140,11 +136,12 @@ class ProfileControlTool(Tool):
         profile_module_name = reasoning_type_module_names[reasoning_type]
         display_name = f"{reasoning_type.title()} Reasoning Profile"
 
-        result = system.run_profile_control(
+        result = await system.run_profile_control(
             profile_module_name=profile_module_name,
             profile_module_control_key=profile_module_control_key,
             profile_module_display_name=display_name,
             action="get_profile",
+            snapshot=snapshot,
         )
 
         return Response(
@@ -152,7 +149,7 @@ class ProfileControlTool(Tool):
             break_loop=result.get("break_loop", False),
         )
 
-    async def _set_profile(self, system: SystemControl, reasoning_type: str, kwargs: dict) -> Response:
+    async def _set_profile(self, system: AsyncSystemControl, reasoning_type: str, kwargs: dict) -> Response:
         """Change reasoning profile for a specific type"""
         if not reasoning_type:
             return Response(
@@ -171,7 +168,7 @@ class ProfileControlTool(Tool):
         profile_module_name = reasoning_type_module_names[reasoning_type]
         display_name = f"{reasoning_type.title()} Reasoning Profile"
 
-        result = system.run_profile_control(
+        result = await system.run_profile_control(
             profile_module_name=profile_module_name,
             profile_module_control_key=profile_module_control_key,
             profile_module_display_name=display_name,
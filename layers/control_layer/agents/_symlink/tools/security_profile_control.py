@@ -1,5 +1,5 @@
 from python.helpers.tool import Tool, Response
-from control_layer.python.helpers.system_control import SystemControl
+from control_layer.python.helpers.system_control import AsyncSystemControl, ConfigSnapshot, get_async_system_control
 
 
 profile_module_name = "security"
@@ -23,10 +23,11 @@ class SecurityProfileControlTool(Tool):
         - set_profile: Change active profile (requires: profile="name")
         """
         
-        system = SystemControl()
+        system = get_async_system_control()
+        snapshot = await system.snapshot()
         
         # Check if tool itself is enabled
-        if not system.is_control_enabled(profile_module_control_key):
+        if not await system.is_control_enabled(profile_module_control_key, snapshot):
             return Response(
                 message=f"{profile_module_display_name} control tool is disabled by current security profile. Admin override required.",
                 break_loop=False
@@ -34,9 +35,9 @@ class SecurityProfileControlTool(Tool):
         
         # Route to action handlers
         if action == "get_state":
-            return await self._get_status(system)
+            return await self._get_status(system, snapshot)
         elif action == "get_profile":
-            return await self._get_profile(system)
+            return await self._get_profile(system, snapshot)
         elif action == "set_profile":
             return await self._set_profile(system, kwargs)
         else:
@@ -45,9 +46,9 @@ class SecurityProfileControlTool(Tool):
                 break_loop=False
             )
     
-    async def _get_status(self, system: SystemControl) -> Response:
+    async def _get_status(self, system: AsyncSystemControl, snapshot: ConfigSnapshot) -> Response:
         """Get current security state (profile and prompt-includes/system control tools)"""
-        state = system.get_security_state()
+        state = await system.get_security_state(snapshot)
         
         # Format response
         lines = [
@@ -83,10 +84,10 @@ class SecurityProfileControlTool(Tool):
             break_loop=False
         )
     
-    async def _get_profile(self, system: SystemControl) -> Response:
+    async def _get_profile(self, system: AsyncSystemControl, snapshot: ConfigSnapshot) -> Response:
         """Get current active profile"""
-        profile_name = system.get_active_profile(profile_module_name)
-        choices = system.get_profile_choices(profile_module_name)
+        profile_name = await system.get_active_profile(profile_module_name, snapshot)
+        choices = await system.get_profile_choices(profile_module_name, snapshot)
         available = choices.get("available_profiles", [])
         
         lines = [
@@ -99,12 +100,12 @@ class SecurityProfileControlTool(Tool):
             break_loop=False
         )
     
-    async def _set_profile(self, system: SystemControl, kwargs: dict) -> Response:
+    async def _set_profile(self, system: AsyncSystemControl, kwargs: dict) -> Response:
         """Change active profile"""
         profile = kwargs.get("profile", "")
         
         if not profile:
-            choices = system.get_profile_choices(profile_module_name)
+            choices = await system.get_profile_choices(profile_module_name)
             available = choices.get("available_profiles", [])
             return Response(
                 message=f"Missing 'profile' parameter. Available profiles: {', '.join(available)}",
@@ -112,7 +113,7 @@ class SecurityProfileControlTool(Tool):
             )
         
         # Attempt to change profile
-        result = system.set_active_profile(profile_module_name, profile)
+        result = await system.set_active_profile(profile_module_name, profile)
         
         if not result.get("success", False):
             error = result.get("error", "Unknown error")
@@ -135,7 +136,7 @@ class SecurityProfileControlTool(Tool):
             ]
         else:
             # No-op success (e.g. already on this profile)
-            active = result.get("profile") or system.get_active_profile(profile_module_name)
+            active = result.get("profile") or await system.get_active_profile(profile_module_name)
             message = result.get(
                 "message",
                 f"Already on {profile_module_display_name.lower()} '{active}'",
@@ -146,8 +147,8 @@ class SecurityProfileControlTool(Tool):
                 f"Active {profile_module_display_name}: {active}",
             ]
         
-        # Get new state to show impact
-        state = system.get_security_state()
+        # Get new state to show impact (one fresh read after the write)
+        state = await system.get_security_state(await system.snapshot())
         lines.append("")
         lines.append("Current prompt-includes/system control tools:")
         for name, info in state['entries'].items():
@@ -0,0 +1,257 @@
+"""JournalConfigStore - Log-structured storage backend for system_control.json
+
+Instead of rewriting the whole document on every change, writes append one
+small JSON-lines record to "<config_path>.journal" describing the changed
+leaves. The config file itself is the base snapshot; loads replay journal
+records newer than the base's config_version on top of it.
+
+Select it with SYSTEM_CONTROL_BACKEND=journal (see CONFIG_BACKENDS in
+system_control). The SystemControl API is unchanged.
+
+Journal record:
+    {"version": 12, "time": "2026-01-01T12:00:00+00:00", "host": "agent-1", "pid": 42,
+     "changes": [{"op": "set", "path": ["prompt_modules", "workflow_profile", "active_profile"],
+                  "value": "verbose"}]}
+
+Compaction:
+    After compact_every records the replayed state is written atomically as the
+    new base (carrying its config_version), then the journal is renamed to
+    "<config_path>.journal.1". Readers read the journal before the base, so a
+    reader racing a compaction sees either the old or the new state, never an
+    older one. history() covers the current and the previous journal.
+"""
+
+import json
+import os
+import socket
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from python.helpers.print_style import PrintStyle
+from control_layer.python.helpers.file_watcher import stat_key
+from control_layer.python.helpers.system_control import ConfigStore, ConfigSnapshot, _CONFIG_CACHE
+
+
+# Records appended before the journal is folded into the base config
+JOURNAL_COMPACT_RECORDS = 100
+
+# Line counts of journals: journal path -> (stat key, lines), kept current by own
+# appends so writes do not re-read the journal to decide on compaction
+_RECORD_COUNTS: Dict[str, Tuple[Optional[tuple], int]] = {}
+
+
+# ============================================================================
+# CHANGE RECORDS
+# ============================================================================
+
+def diff_config(old: Any, new: Any, path: Optional[list] = None) -> List[dict]:
+    """Return set/delete operations turning old into new, at leaf granularity.
+
+    Nested dicts are compared key by key; any other value (including lists) is
+    replaced as a whole. The top-level "config_version" key is ignored.
+    """
+    path = path or []
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return [] if old == new else [{"op": "set", "path": path, "value": new}]
+
+    ignored = set() if path else {"config_version"}
+    changes = []
+    for key in old:
+        if key not in new and key not in ignored:
+            changes.append({"op": "delete", "path": path + [key]})
+    for key, value in new.items():
+        if key in ignored:
+            continue
+        if key not in old:
+            changes.append({"op": "set", "path": path + [key], "value": value})
+        else:
+            changes.extend(diff_config(old[key], value, path + [key]))
+    return changes
+
+
+def apply_changes(config: dict, changes: List[dict]) -> None:
+    """Apply set/delete operations from diff_config to config in place."""
+    for change in changes:
+        path = change.get("path") or []
+        if not path:
+            if change.get("op") == "set" and isinstance(change.get("value"), dict):
+                config.clear()
+                config.update(change["value"])
+            continue
+
+        parent = config
+        for key in path[:-1]:
+            child = parent.get(key)
+            if not isinstance(child, dict):
+                child = {}
+                parent[key] = child
+            parent = child
+
+        if change.get("op") == "delete":
+            parent.pop(path[-1], None)
+        else:
+            parent[path[-1]] = change.get("value")
+
+
+# ============================================================================
+# STORAGE BACKEND
+# ============================================================================
+
+class JournalConfigStore(ConfigStore):
+    """ConfigStore that appends change records instead of rewriting the config.
+
+    Locking, versioning, caching and snapshots behave exactly like ConfigStore;
+    only the read path (base + replay) and the write path (append, periodic
+    compaction) differ.
+    """
+
+    def __init__(
+        self,
+        config_path: str,
+        admin_override_path: str,
+        compact_every: int = JOURNAL_COMPACT_RECORDS,
+    ):
+        super().__init__(config_path, admin_override_path)
+        self.journal_path = f"{config_path}.journal"
+        self.compact_every = compact_every
+
+    def _stat_key(self) -> Optional[tuple]:
+        """Cache key covering the journal and the base config (journal first, like reads)."""
+        return (stat_key(self.journal_path), stat_key(self.config_path))
+
+    def watch_paths(self) -> List[str]:
+        """Files whose changes can alter snapshot() results."""
+        return [self.config_path, self.journal_path, self.admin_override_path]
+
+    def _read_config(self) -> Optional[dict]:
+        """Read the base config and replay newer journal records on top of it."""
+        # Journal before base: see the module docstring on compaction races
+        records = self._read_records(self.journal_path)
+        config = super()._read_config()
+        if config is None:
+            if not records:
+                return None
+            config = self._get_default_config()
+
+        for record in records:
+            version = record.get("version", 0)
+            if version <= config.get("config_version", 0):
+                continue
+            apply_changes(config, record.get("changes", []))
+            config["config_version"] = version
+        return config
+
+    def _read_records(self, path: str) -> List[dict]:
+        """Read journal records from path, skipping unreadable or torn lines."""
+        try:
+            with open(path, "r", encoding="utf-8") as journal:
+                lines = journal.readlines()
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            PrintStyle().error(f"❌ JournalConfigStore error reading {path}: {e}")
+            return []
+
+        records = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A crash mid-append can leave one partial trailing line
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+        return records
+
+    def _save_locked(self, config: dict, current: dict) -> bool:
+        """Append the difference to current (loaded under the same lock); the caller must hold write_lock()."""
+        current_version = ConfigSnapshot(config=current).version
+        changes = diff_config(current, config)
+        config["config_version"] = current_version + 1
+
+        record = {
+            "version": current_version + 1,
+            "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "changes": changes,
+        }
+        count = self._record_count() + 1
+        self._append_record(record)
+        _RECORD_COUNTS[self.journal_path] = (stat_key(self.journal_path), count)
+        _CONFIG_CACHE.pop(self.config_path, None)
+
+        if count >= self.compact_every:
+            self._compact_locked(config)
+        return True
+
+    def _record_count(self) -> int:
+        """Number of complete lines in the journal, recounted only after foreign writes."""
+        key = stat_key(self.journal_path)
+        cached = _RECORD_COUNTS.get(self.journal_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            with open(self.journal_path, "rb") as journal:
+                count = sum(chunk.count(b"\n") for chunk in iter(lambda: journal.read(65536), b""))
+        except FileNotFoundError:
+            count = 0
+        _RECORD_COUNTS[self.journal_path] = (key, count)
+        return count
+
+    def _append_record(self, record: dict) -> None:
+        """Append one record as a single line and fsync it; the caller must hold write_lock()."""
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        fd = os.open(self.journal_path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            self._truncate_torn_tail(fd)
+            os.write(fd, line.encode("utf-8"))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _truncate_torn_tail(fd: int) -> None:
+        """Cut a partial last line left by a crashed append so the next record starts on its own line."""
+        size = os.fstat(fd).st_size
+        end = size
+        while end > 0:
+            start = max(0, end - 4096)
+            chunk = os.pread(fd, end - start, start)
+            if end == size and chunk.endswith(b"\n"):
+                return
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                os.ftruncate(fd, start + newline + 1)
+                return
+            end = start
+        if size:
+            os.ftruncate(fd, 0)
+
+    def compact(self) -> bool:
+        """Fold the journal into the base config now."""
+        try:
+            with self.write_lock():
+                config = self._read_config() or self._get_default_config()
+                self._compact_locked(config)
+            return True
+        except Exception as e:
+            PrintStyle().error(f"❌ JournalConfigStore compaction error: {e}")
+            return False
+
+    def _compact_locked(self, config: dict) -> None:
+        """Write config as the new base, then retire the journal; caller holds write_lock()."""
+        self._write_atomic(json.dumps(config, indent=2))
+        if os.path.exists(self.journal_path):
+            os.replace(self.journal_path, f"{self.journal_path}.1")
+        _RECORD_COUNTS.pop(self.journal_path, None)
+        _CONFIG_CACHE.pop(self.config_path, None)
+
+    def history(self, limit: Optional[int] = None) -> List[dict]:
+        """Return change records from the previous and current journal, oldest first."""
+        records = self._read_records(f"{self.journal_path}.1") + self._read_records(self.journal_path)
+        if limit is not None:
+            records = records[-limit:] if limit > 0 else []
+        return records
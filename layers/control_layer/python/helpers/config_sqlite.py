@@ -0,0 +1,305 @@
+"""SqliteConfigStore - Shared SQLite storage backend for fleets of agents
+
+Stores the configuration of many agents in one SQLite database (WAL mode, so
+readers never block each other or the writer). Every config leaf is one row
+keyed by (scope, path):
+
+    - "fleet" scope: defaults shared by every agent
+    - agent scope: per-agent values layered on top of the fleet defaults
+
+An agent's effective config is the fleet rows overlaid with its own rows; a
+NULL value in the agent scope hides a fleet leaf. Each scope has its own
+version counter and the effective config_version is their sum, so it grows
+with every write that can change what the agent sees.
+
+Select it with SYSTEM_CONTROL_BACKEND=sqlite (see CONFIG_BACKENDS in
+system_control). Environment:
+    - SYSTEM_CONTROL_DB: database path (default: control file path with ".db")
+    - SYSTEM_CONTROL_SCOPE: this agent's scope name (default: hostname)
+
+On first use the fleet scope is seeded from the JSON control file, or from the
+built-in defaults when it does not exist. Agent writes (set_active_profile,
+apply, ...) go to the agent scope; update_fleet() changes the fleet defaults
+for every agent in one transaction.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+from python.helpers.print_style import PrintStyle
+from control_layer.python.helpers.system_control import ConfigStore, ConfigSnapshot, _CONFIG_CACHE
+
+
+FLEET_SCOPE = "fleet"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS config_entries (
+    scope TEXT NOT NULL,
+    path TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (scope, path)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS config_versions (
+    scope TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Open connections per thread: db_path -> connection, shared by every store on that
+# thread (call sites create a SystemControl per query, so stores are short-lived)
+_CONNECTIONS = threading.local()
+
+# Databases whose schema and fleet seed were already checked in this process
+_INITIALIZED: Set[str] = set()
+_INITIALIZED_LOCK = threading.Lock()
+
+
+# ============================================================================
+# LEAF ENCODING
+# ============================================================================
+
+def flatten_config(config: dict, prefix: Tuple[str, ...] = ()) -> Dict[Tuple[str, ...], object]:
+    """Flatten nested dicts into {path tuple: leaf value}; empty dicts are leaves."""
+    leaves = {}
+    for key, value in config.items():
+        if not prefix and key == "config_version":
+            continue
+        path = prefix + (key,)
+        if isinstance(value, dict) and value:
+            leaves.update(flatten_config(value, path))
+        else:
+            leaves[path] = value
+    return leaves
+
+
+def build_config(leaves: Dict[Tuple[str, ...], object]) -> dict:
+    """Rebuild a nested config from {path tuple: leaf value}, shortest paths first."""
+    config: dict = {}
+    for path in sorted(leaves, key=len):
+        parent = config
+        for key in path[:-1]:
+            child = parent.get(key)
+            if not isinstance(child, dict):
+                child = {}
+                parent[key] = child
+            parent = child
+        parent[path[-1]] = leaves[path]
+    return config
+
+
+# ============================================================================
+# STORAGE BACKEND
+# ============================================================================
+
+class SqliteConfigStore(ConfigStore):
+    """ConfigStore reading and writing one scope of a shared SQLite database.
+
+    Writes run in a BEGIN IMMEDIATE transaction instead of the flock used by the
+    JSON store, so all agents sharing the database are serialized by SQLite.
+    Connections are per thread and database, shared across store instances;
+    the schema and fleet seed are set up once per database and process.
+    """
+
+    def __init__(self, config_path: str, admin_override_path: str):
+        super().__init__(config_path, admin_override_path)
+        self.db_path = os.environ.get("SYSTEM_CONTROL_DB") or os.path.splitext(config_path)[0] + ".db"
+        self.scope = os.environ.get("SYSTEM_CONTROL_SCOPE") or socket.gethostname()
+
+    # ------------------------------------------------------------------------
+    # Connections and transactions
+    # ------------------------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection to db_path (the open write transaction's, if any)."""
+        connections = getattr(_CONNECTIONS, "by_path", None)
+        if connections is None:
+            connections = _CONNECTIONS.by_path = {}
+        conn = connections.get(self.db_path)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            connections[self.db_path] = conn
+        if self.db_path not in _INITIALIZED:
+            with _INITIALIZED_LOCK:
+                if self.db_path not in _INITIALIZED:
+                    # journal_mode=WAL is persistent in the database file
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                    self._seed_fleet(conn)
+                    _INITIALIZED.add(self.db_path)
+        return conn
+
+    @contextmanager
+    def _transaction(
+        self, immediate: bool = False, conn: Optional[sqlite3.Connection] = None
+    ) -> Iterator[sqlite3.Connection]:
+        """Run a transaction, or join the one already open on this thread."""
+        conn = conn or self._connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @contextmanager
+    def write_lock(self) -> Iterator[None]:
+        """Hold SQLite's write lock; loads and saves inside join the transaction."""
+        with self._transaction(immediate=True):
+            yield
+
+    def _seed_fleet(self, conn: sqlite3.Connection) -> None:
+        """Populate the fleet scope from the JSON control file on first use."""
+        with self._transaction(immediate=True, conn=conn):
+            row = conn.execute("SELECT 1 FROM config_versions WHERE scope = ?", (FLEET_SCOPE,)).fetchone()
+            if row is not None:
+                return
+            config = super()._read_config() if os.path.exists(self.config_path) else None
+            if config is None:
+                config = self._get_default_config()
+            self._write_leaves(conn, FLEET_SCOPE, flatten_config(config))
+            conn.execute(
+                "INSERT INTO config_versions (scope, version) VALUES (?, ?)",
+                (FLEET_SCOPE, int(config.get("config_version", 0) or 0)),
+            )
+            PrintStyle().info(f"SqliteConfigStore seeded fleet scope in {self.db_path}")
+
+    # ------------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------------
+
+    def _versions(self, conn: sqlite3.Connection) -> Tuple[int, int]:
+        rows = dict(conn.execute(
+            "SELECT scope, version FROM config_versions WHERE scope IN (?, ?)", (FLEET_SCOPE, self.scope)
+        ).fetchall())
+        return rows.get(FLEET_SCOPE, 0), rows.get(self.scope, 0) if self.scope != FLEET_SCOPE else 0
+
+    def _stat_key(self) -> Optional[tuple]:
+        """Cache key: database, scope and both scope versions."""
+        try:
+            return (self.db_path, self.scope) + self._versions(self._connection())
+        except sqlite3.Error as e:
+            PrintStyle().error(f"❌ SqliteConfigStore error reading versions: {e}")
+            return None
+
+    def _read_config(self) -> Optional[dict]:
+        """Read the effective config of this scope (fleet rows overlaid with agent rows)."""
+        try:
+            with self._transaction() as conn:
+                return self._read_scopes(conn, (FLEET_SCOPE, self.scope))
+        except sqlite3.Error as e:
+            PrintStyle().error(f"❌ SqliteConfigStore error reading {self.db_path}: {e}")
+            return None
+
+    def _read_scopes(self, conn: sqlite3.Connection, scopes: Tuple[str, ...]) -> dict:
+        """Overlay the leaves of scopes in order and attach the summed config_version."""
+        leaves: Dict[Tuple[str, ...], object] = {}
+        for scope in dict.fromkeys(scopes):
+            for path, value in conn.execute(
+                "SELECT path, value FROM config_entries WHERE scope = ?", (scope,)
+            ):
+                key = tuple(json.loads(path))
+                if value is None:
+                    leaves.pop(key, None)
+                else:
+                    leaves[key] = json.loads(value)
+        config = build_config(leaves)
+        fleet_version, scope_version = self._versions(conn)
+        config["config_version"] = fleet_version + (scope_version if self.scope in scopes else 0)
+        return config
+
+    def scopes(self) -> Dict[str, int]:
+        """Return every scope in the database with its version."""
+        with self._transaction() as conn:
+            return dict(conn.execute("SELECT scope, version FROM config_versions ORDER BY scope").fetchall())
+
+    # ------------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------------
+
+    def _write_leaves(self, conn: sqlite3.Connection, scope: str, leaves: Dict[Tuple[str, ...], object]) -> None:
+        """Insert or replace leaf values in scope."""
+        conn.executemany(
+            "INSERT OR REPLACE INTO config_entries (scope, path, value) VALUES (?, ?, ?)",
+            [(scope, json.dumps(list(path)), json.dumps(value)) for path, value in leaves.items()],
+        )
+
+    def _bump_version(self, conn: sqlite3.Connection, scope: str) -> None:
+        conn.execute(
+            "INSERT INTO config_versions (scope, version) VALUES (?, 1) "
+            "ON CONFLICT(scope) DO UPDATE SET version = version + 1",
+            (scope,),
+        )
+
+    def _save_locked(self, config: dict, current: dict) -> bool:
+        """Store the leaves that differ from current (read in this transaction) in this agent's scope."""
+        conn = self._connection()
+        current_version = ConfigSnapshot(config=current).version
+        current = flatten_config(current)
+        new = flatten_config(config)
+
+        changed = {path: value for path, value in new.items() if path not in current or current[path] != value}
+        removed = [path for path in current if path not in new]
+        self._write_leaves(conn, self.scope, changed)
+        conn.executemany(
+            "INSERT OR REPLACE INTO config_entries (scope, path, value) VALUES (?, ?, NULL)",
+            [(self.scope, json.dumps(list(path))) for path in removed],
+        )
+        self._bump_version(conn, self.scope)
+        config["config_version"] = current_version + 1
+        _CONFIG_CACHE.pop(self.config_path, None)
+        return True
+
+    def update_fleet(
+        self,
+        mutate: Callable[[ConfigSnapshot, dict], Tuple[bool, dict]],
+        override_agents: bool = True,
+    ) -> dict:
+        """Run a read-modify-write on the fleet defaults in one transaction.
+
+        mutate(snapshot, config) works like in ConfigStore.update, but sees the
+        fleet scope alone. With override_agents, per-agent values for the changed
+        paths are removed so the new fleet value takes effect on every agent.
+        """
+        try:
+            with self._transaction(immediate=True) as conn:
+                fleet = self._read_scopes(conn, (FLEET_SCOPE,))
+                snapshot = ConfigSnapshot(config=fleet, admin_override=self.has_admin_override())
+                config = snapshot.mutable_config()
+                changed, result = mutate(snapshot, config)
+                if not changed:
+                    return result
+
+                current = flatten_config(fleet)
+                new = flatten_config(config)
+                updated = {path: value for path, value in new.items() if path not in current or current[path] != value}
+                removed = [path for path in current if path not in new]
+                self._write_leaves(conn, FLEET_SCOPE, updated)
+                conn.executemany(
+                    "DELETE FROM config_entries WHERE scope = ? AND path = ?",
+                    [(FLEET_SCOPE, json.dumps(list(path))) for path in removed],
+                )
+                if override_agents:
+                    conn.executemany(
+                        "DELETE FROM config_entries WHERE scope != ? AND path = ?",
+                        [(FLEET_SCOPE, json.dumps(list(path))) for path in list(updated) + removed],
+                    )
+                self._bump_version(conn, FLEET_SCOPE)
+            _CONFIG_CACHE.pop(self.config_path, None)
+            return result
+        except Exception as e:
+            PrintStyle().error(f"❌ SqliteConfigStore fleet write error: {e}")
+            return {"success": False, "error": "Failed to write configuration"}
+
+    def watch_paths(self) -> List[str]:
+        """Files whose changes can alter snapshot() results (commits land in the WAL)."""
+        return [self.db_path, f"{self.db_path}-wal", self.admin_override_path]
@@ -0,0 +1,103 @@
+"""Control extras - Change-aware "System control extras" block for the message loop
+
+The _72_include_systen_control_extras extension adds a short block with the
+security profile, the admin override state and the active profile of every
+enabled profile module to extras_temporary on each loop iteration.
+
+The rendered block depends only on the configuration, so it is cached per
+config contents: while the snapshot (or its fingerprint, a hash of the config
+and override state) is unchanged, no security, profile module or profile state
+lookups run. Hand edits that do not bump config_version are picked up too.
+
+The system_control_extras.mode config setting selects what is injected:
+
+    - "full": the block on every turn (default)
+    - "delta": the block when it differs from the one the agent saw on its
+      last turn, otherwise a single line with the security profile, the
+      override state and the block's fingerprint
+"""
+
+from typing import Any, Dict, Optional, Tuple
+from control_layer.python.helpers import prompt_budget
+from control_layer.python.helpers.system_control import ConfigSnapshot, SystemControl
+
+
+# Agent data key of the fingerprint of the extras the agent saw last
+LAST_FINGERPRINT_KEY = "system_control_extras_fingerprint"
+
+FINGERPRINT_LENGTH = 12
+
+# Rendered extras per config path: (snapshot, snapshot fingerprint, rendered)
+_RENDER_CACHE: Dict[str, Tuple[ConfigSnapshot, str, dict]] = {}
+
+
+def _render(system: SystemControl, snapshot: ConfigSnapshot) -> dict:
+    extras = system.get_all_profiles_extras(snapshot)
+    profiles = extras.get("profiles", {})
+
+    lines: list[str] = []
+
+    lines.append("# System control extras")
+    lines.append("")
+
+    security_profile = snapshot.get_active("security")
+    security_admin_override = "ACTIVE" if snapshot.admin_override else "inactive"
+
+    lines.append(f"Active security profile: {security_profile}")
+    lines.append(f"Admin override: {security_admin_override}")
+    lines.append("")
+
+    # Append enabled profile modules in a concise form: profile_module_name:active_profile
+    for profile_module_name in sorted(profiles.keys()):
+        profile_data = profiles.get(profile_module_name, {})
+        if not profile_data.get("enabled", False):
+            continue
+        active_profile = profile_data.get("active_profile", "unknown")
+        lines.append(f"{profile_module_name}:{active_profile}")
+        lines.append("")
+
+    block = "\n".join(lines)
+    fingerprint = prompt_budget.content_hash(block)[:FINGERPRINT_LENGTH]
+    return {
+        "block": block,
+        "fingerprint": fingerprint,
+        "summary": (
+            f"# System control extras unchanged since last turn "
+            f"(security profile: {security_profile}, admin override: {security_admin_override}, "
+            f"fingerprint: {fingerprint})"
+        ),
+    }
+
+
+def get_rendered_extras(system: SystemControl, snapshot: Optional[ConfigSnapshot] = None) -> dict:
+    """Return {"block", "fingerprint", "summary"}, rendering only when the config contents changed."""
+    snapshot = snapshot or system.snapshot()
+    path = system.config_store.config_path
+    cached = _RENDER_CACHE.get(path)
+    if cached is not None:
+        cached_snapshot, fingerprint, rendered = cached
+        if cached_snapshot is snapshot or fingerprint == snapshot.fingerprint:
+            return rendered
+
+    rendered = _render(system, snapshot)
+    _RENDER_CACHE[path] = (snapshot, snapshot.fingerprint, rendered)
+    return rendered
+
+
+def extras_for_agent(
+    agent: Any, system: Optional[SystemControl] = None, snapshot: Optional[ConfigSnapshot] = None
+) -> str:
+    """Return the extras text to inject for agent this turn, honouring the configured mode."""
+    system = system or SystemControl()
+    # One snapshot so the mode, security state and profile extras agree with each other
+    snapshot = snapshot or system.snapshot()
+    rendered = get_rendered_extras(system, snapshot)
+    mode = system.get_extras_mode(snapshot)
+
+    last_fingerprint = agent.get_data(LAST_FINGERPRINT_KEY) if agent is not None else None
+    if agent is not None:
+        agent.set_data(LAST_FINGERPRINT_KEY, rendered["fingerprint"])
+
+    if mode == "delta" and last_fingerprint == rendered["fingerprint"]:
+        return rendered["summary"]
+    return rendered["block"]
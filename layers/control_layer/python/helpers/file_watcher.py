@@ -0,0 +1,230 @@
+"""FileWatcher - Change notifications for individual files
+
+Watches a set of file paths and calls subscribers with the paths whose
+(st_mtime_ns, st_size, st_ino) changed, including creation and deletion.
+
+Backends:
+    - inotify (Linux): the parent directory of each file is watched, so atomic
+      rename-over writes and files that do not exist yet are both detected
+    - polling: used when inotify is unavailable or a directory cannot be
+      watched; files are re-stat'ed every poll_interval seconds
+
+Events are always confirmed against the file's stat key before subscribers are
+called, so unrelated activity in a watched directory never triggers a callback.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from python.helpers.print_style import PrintStyle
+
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def stat_key(path: str) -> Optional[tuple]:
+    """Return (st_mtime_ns, st_size, st_ino) for path, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class _Inotify:
+    """Minimal ctypes binding to the Linux inotify API."""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, directory: str, mask: int) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), ctypes.c_uint32(mask))
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        return wd
+
+    def read_events(self, timeout: float) -> List[tuple]:
+        """Wait up to timeout seconds and return a list of (wd, mask, name) events."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            events.append((wd, mask, name))
+        return events
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class FileWatcher:
+    """Background watcher calling subscribers with the set of changed file paths.
+
+    The watcher thread is a daemon started on the first subscription. Callbacks
+    run on that thread and must be quick and thread-safe; exceptions raised by a
+    callback are logged and do not affect other subscribers.
+    """
+
+    def __init__(self, paths: Iterable[str] = (), poll_interval: float = 1.0, use_inotify: bool = True):
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self._lock = threading.Lock()
+        self._keys: Dict[str, Optional[tuple]] = {}
+        self._subscribers: List[Callable[[Set[str]], None]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._inotify: Optional[_Inotify] = None
+        self._watched_dirs: Dict[int, str] = {}
+        self._polled: Set[str] = set()
+        for path in paths:
+            self.add(path)
+
+    @property
+    def backend(self) -> str:
+        """Name of the active backend: 'inotify', 'polling' or 'stopped'."""
+        if self._thread is None:
+            return "stopped"
+        return "inotify" if self._inotify is not None and not self._polled else "polling"
+
+    def add(self, path: str) -> None:
+        """Start watching an additional file path."""
+        path = os.path.abspath(path)
+        with self._lock:
+            if path in self._keys:
+                return
+            self._keys[path] = stat_key(path)
+            if self._thread is not None:
+                self._watch_path(path)
+
+    def subscribe(self, callback: Callable[[Set[str]], None]) -> Callable[[], None]:
+        """Register callback(changed_paths) and return a function that unsubscribes it."""
+        with self._lock:
+            self._subscribers.append(callback)
+            if self._thread is None:
+                self._start()
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def stop(self) -> None:
+        """Stop the watcher thread and release the inotify descriptor."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._thread = None
+
+    def _start(self) -> None:
+        """Set up the backend and start the thread; the caller holds self._lock."""
+        if self.use_inotify and hasattr(os, "O_CLOEXEC"):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                PrintStyle().hint(f"FileWatcher: inotify unavailable ({e}), using polling")
+                self._inotify = None
+        for path in self._keys:
+            self._watch_path(path)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="control-layer-file-watcher", daemon=True)
+        self._thread.start()
+
+    def _watch_path(self, path: str) -> None:
+        """Watch the parent directory of path, falling back to polling for it."""
+        if self._inotify is None:
+            self._polled.add(path)
+            return
+        directory = os.path.dirname(path)
+        if directory in self._watched_dirs.values():
+            return
+        try:
+            wd = self._inotify.add_watch(directory, WATCH_MASK)
+            self._watched_dirs[wd] = directory
+        except OSError:
+            self._polled.add(path)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            candidates: Set[str] = set()
+            if self._inotify is not None and self._watched_dirs:
+                try:
+                    events = self._inotify.read_events(self.poll_interval)
+                except OSError as e:
+                    PrintStyle().warning(f"⚠️ FileWatcher inotify read failed ({e}), using polling")
+                    # Drop the broken descriptor so the polling branch (and its wait) takes over
+                    with self._lock:
+                        inotify, self._inotify = self._inotify, None
+                        self._watched_dirs.clear()
+                        self._polled.update(self._keys)
+                    inotify.close()
+                    events = []
+                for wd, mask, name in events:
+                    if mask & IN_Q_OVERFLOW:
+                        candidates.update(self._keys)
+                        continue
+                    directory = self._watched_dirs.get(wd)
+                    if directory is not None and name:
+                        candidates.add(os.path.join(directory, name))
+            else:
+                self._stop.wait(self.poll_interval)
+
+            with self._lock:
+                candidates = {p for p in candidates if p in self._keys}
+                candidates.update(self._polled)
+            self._check(candidates)
+
+    def _check(self, candidates: Set[str]) -> None:
+        """Compare stat keys of candidate paths and notify subscribers of real changes."""
+        changed: Set[str] = set()
+        with self._lock:
+            for path in candidates:
+                key = stat_key(path)
+                if key != self._keys.get(path):
+                    self._keys[path] = key
+                    changed.add(path)
+            subscribers = list(self._subscribers)
+        if not changed:
+            return
+        for callback in subscribers:
+            try:
+                callback(changed)
+            except Exception as e:
+                PrintStyle().error(f"❌ FileWatcher subscriber error: {e}")
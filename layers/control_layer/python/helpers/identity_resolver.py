@@ -0,0 +1,212 @@
+"""AgentIdentityResolver - Indexed, watched lookup of agent identity prompts
+
+An agent's identity is looked up in two places, by agent profile name:
+
+    - agents/<profile>/prompts/<profile>.md                  (agent profile prompt)
+    - /common/prompts/agent_identity/identities/<profile>.md  (The Book of Agent Identities)
+
+Instead of attempting a read in each location on every render, the resolver
+keeps an index of candidate file -> exists. A profile's two candidates are
+stat'ed once, when the profile is first looked up, and then watched with
+FileWatcher; creating, editing or deleting one updates the index and drops the
+cached variables of that profile. Hits and misses are both cached, so a
+profile without an identity costs a dictionary lookup.
+
+The cached value is the finished variables dict of the agent_identity prompt
+include, keyed by profile and the render kwargs other than the agent object.
+It is rendered under a segment_cache recorder and stored with the dependencies
+it recorded, so edits to files pulled in by {{ include }} (which the watcher
+does not cover) are picked up on the next lookup.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Set, Tuple
+from python.helpers import files
+from python.helpers.print_style import PrintStyle
+from control_layer.python.helpers import prompt_templates, segment_cache
+from control_layer.python.helpers.file_watcher import FileWatcher
+
+
+IDENTITY_DIR = "/common/prompts/agent_identity/identities"
+AGENTS_DIR = "agents"
+IDENTITY_WATCH_POLL_INTERVAL = 1.0
+
+_RESOLVER: Optional["AgentIdentityResolver"] = None
+_RESOLVER_LOCK = threading.Lock()
+
+
+def _profile_prompts_dir(agent_profile: str) -> str:
+    return f"{AGENTS_DIR}/{agent_profile}/prompts"
+
+
+class AgentIdentityResolver:
+    """Resolve and cache the agent_identity variables per agent profile."""
+
+    def __init__(self, identity_dir: str = IDENTITY_DIR, watch: bool = True):
+        self.identity_dir = identity_dir
+        self._lock = threading.RLock()
+        self._exists: Dict[str, bool] = {}
+        self._path_profiles: Dict[str, str] = {}
+        self._variables: Dict[Tuple[str, str], Tuple[Dict[str, Any], segment_cache.SegmentEntry]] = {}
+        self._watcher: Optional[FileWatcher] = None
+        if watch:
+            self._watcher = FileWatcher(poll_interval=IDENTITY_WATCH_POLL_INTERVAL)
+            self._watcher.subscribe(self._on_files_changed)
+
+    # ------------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------------
+
+    def _candidate(self, directory: str, agent_profile: str) -> str:
+        return os.path.abspath(files.get_abs_path(directory, f"{agent_profile}.md"))
+
+    def _track(self, path: str, agent_profile: str) -> bool:
+        """Index and watch a candidate file on first lookup; return whether it exists."""
+        if path not in self._path_profiles:
+            self._path_profiles[path] = agent_profile
+            if self._watcher is not None:
+                self._watcher.add(path)
+            # Stat after the watch is in place, so a file created meanwhile is not missed
+            self._exists[path] = os.path.isfile(path)
+        return self._exists[path]
+
+    def _on_files_changed(self, paths: Set[str]) -> None:
+        """FileWatcher callback: update the index and drop cached variables of affected profiles."""
+        with self._lock:
+            for path in paths:
+                self._exists[path] = os.path.isfile(path)
+                agent_profile = self._path_profiles.get(path)
+                if agent_profile is not None:
+                    self.invalidate(agent_profile)
+
+    def invalidate(self, agent_profile: Optional[str] = None) -> None:
+        """Drop cached variables of agent_profile, or of every profile."""
+        with self._lock:
+            for key in [k for k in self._variables if agent_profile is None or k[0] == agent_profile]:
+                del self._variables[key]
+
+    # ------------------------------------------------------------------------
+    # Resolution
+    # ------------------------------------------------------------------------
+
+    def get_variables(self, agent_profile: str, **kwargs) -> Dict[str, Any]:
+        """Return the agent_identity variables for agent_profile, rendering only on cache misses."""
+        try:
+            kwargs_key = json.dumps(
+                {k: v for k, v in kwargs.items() if k != "agent"}, sort_keys=True, default=repr
+            )
+        except (TypeError, ValueError):
+            kwargs_key = None
+
+        key = (agent_profile, kwargs_key)
+        with self._lock:
+            profile_path = self._candidate(_profile_prompts_dir(agent_profile), agent_profile)
+            identity_path = self._candidate(self.identity_dir, agent_profile)
+            profile_exists = self._track(profile_path, agent_profile)
+            identity_exists = self._track(identity_path, agent_profile)
+            # Cached segments that render the identity depend on both candidates, hit or miss
+            segment_cache.record_file(profile_path)
+            segment_cache.record_file(identity_path)
+            cached = self._variables.get(key) if kwargs_key is not None else None
+            if cached is not None and segment_cache.reuse_entry(cached[1]):
+                return dict(cached[0])
+
+        (variables, cacheable), entry = segment_cache.run_recorded(
+            lambda: self._render(agent_profile, profile_path, profile_exists, identity_path, identity_exists, **kwargs)
+        )
+        if cacheable and kwargs_key is not None:
+            with self._lock:
+                self._variables[key] = (dict(variables), entry)
+        return variables
+
+    def _load_prompt(
+        self,
+        agent_profile: str,
+        directory: str,
+        path: str,
+        exists: bool,
+        found_msg: str,
+        missing_msg: str,
+        **kwargs,
+    ) -> Tuple[str, str, bool, bool]:
+        """Return (prompt, status message, success, cacheable) for one identity location."""
+        if not exists:
+            return missing_msg, missing_msg, False, True
+        try:
+            # Record nested includes too: they are dependencies of the cached variables
+            prompt_templates.record_include_tree(path, [directory])
+            content = prompt_templates.read_prompt_file(path, _directories=[directory], **kwargs)
+            return content, found_msg, True, True
+        except FileNotFoundError:
+            return missing_msg, missing_msg, False, True
+        except Exception as e:
+            error_msg = f"Error loading agent profile '{agent_profile}' from '{directory}': {e}"
+            PrintStyle().error(error_msg)
+            error_prompt = f"(Error loading agent profile: {agent_profile})"
+            return error_prompt, error_msg, False, False
+
+    def _render(
+        self,
+        agent_profile: str,
+        profile_path: str,
+        profile_exists: bool,
+        identity_path: str,
+        identity_exists: bool,
+        **kwargs,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Build the agent_identity variables; the flag is False if a load error occurred."""
+        agent_identity_dir_msg_found = f"## '{agent_profile}' in The Book of Agent Identities\n\n"
+        agent_identity_dir_msg_not_found = ""
+        agent_profile_dir_msg_found = f"## '{agent_profile}' in agent profile prompts directory\n\n"
+        agent_profile_dir_msg_not_found = ""
+        agent_identity_found_true = "Agent identity located"
+        agent_identity_found_false = "Agent identity not found"
+
+        profile_prompt, profile_status_msg, profile_success, profile_cacheable = self._load_prompt(
+            agent_profile,
+            _profile_prompts_dir(agent_profile),
+            profile_path,
+            profile_exists,
+            agent_profile_dir_msg_found,
+            agent_profile_dir_msg_not_found,
+            **kwargs,
+        )
+        identity_prompt, identity_status_msg, identity_success, identity_cacheable = self._load_prompt(
+            agent_profile,
+            self.identity_dir,
+            identity_path,
+            identity_exists,
+            agent_identity_dir_msg_found,
+            agent_identity_dir_msg_not_found,
+            **kwargs,
+        )
+
+        if profile_success and identity_success:
+            agent_identity_where = " in both the agent profile prompts directory and The Book of Agent Identities"
+        elif profile_success or identity_success:
+            agent_identity_where = ""
+        else:
+            agent_identity_where = " in either the agent profile prompts directory or The Book of Agent Identities"
+
+        agent_identity_found_msg = agent_identity_found_true if profile_success or identity_success else agent_identity_found_false
+
+        return {
+            "agent_profile_prompt_lf": "\n" if profile_success else "",
+            "agent_profile_prompt_status": profile_status_msg,
+            "agent_profile_prompt": profile_prompt,
+            "agent_identity_prompt_lf": "\n" if identity_success else "",
+            "agent_identity_prompt_status": identity_status_msg,
+            "agent_identity_prompt": identity_prompt,
+            "agent_identity_found_where": agent_identity_found_msg + agent_identity_where,
+        }, profile_cacheable and identity_cacheable
+
+
+def get_identity_resolver() -> AgentIdentityResolver:
+    """Return the process-wide resolver, creating it on first use."""
+    global _RESOLVER
+    with _RESOLVER_LOCK:
+        if _RESOLVER is None:
+            _RESOLVER = AgentIdentityResolver()
+        return _RESOLVER
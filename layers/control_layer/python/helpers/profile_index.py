@@ -0,0 +1,138 @@
+"""ProfileModuleIndex - Index of profile modules and their profiles.json definitions
+
+Scans control_layer/profile_modules/*/profiles.json once and keeps the parsed
+profile and feature definitions in memory, so SystemControl can list and
+validate module-based profiles without reading files on each call.
+
+The index is revalidated on access against the stat keys of the modules
+directory and of <module>/profiles.json for every subdirectory, whether it
+parsed or not: adding, removing, fixing or editing a module is picked up on the
+next lookup, and an unchanged tree costs only those stats.
+Inside revalidation_skipped() lookups use the index as is; AsyncSystemControl
+uses it to answer queries on the event loop after refreshing in a worker thread.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from python.helpers.print_style import PrintStyle
+from control_layer.python.helpers.file_watcher import stat_key
+
+
+# control_layer/python/helpers/profile_index.py -> control_layer/profile_modules
+PROFILE_MODULES_DIR = str(Path(__file__).resolve().parents[2] / "profile_modules")
+
+_INDEXES: Dict[str, "ProfileModuleIndex"] = {}
+
+# True while lookups must not stat the tree (see revalidation_skipped())
+_SKIP_REVALIDATION: ContextVar[bool] = ContextVar("profile_index_skip_revalidation", default=False)
+
+
+@contextmanager
+def revalidation_skipped() -> Iterator[None]:
+    """Serve lookups from the already built index without statting the modules tree."""
+    token = _SKIP_REVALIDATION.set(True)
+    try:
+        yield
+    finally:
+        _SKIP_REVALIDATION.reset(token)
+
+
+class ProfileModuleIndex:
+    """In-memory index: module name -> {profile name -> profile definition}."""
+
+    def __init__(self, modules_dir: str = PROFILE_MODULES_DIR):
+        self.modules_dir = modules_dir
+        self._modules: Dict[str, Dict[str, dict]] = {}
+        # Every entry of the modules directory at the last scan, indexed or not
+        self._entries: List[str] = []
+        self._keys: Dict[str, Optional[tuple]] = {}
+
+    def _current_keys(self) -> Dict[str, Optional[tuple]]:
+        """Stat keys of the modules directory and of profiles.json in every listed entry.
+
+        Missing and unparseable files are tracked too, so a profiles.json that is
+        created or repaired later triggers a rescan.
+        """
+        keys = {self.modules_dir: stat_key(self.modules_dir)}
+        for module_name in self._entries:
+            path = os.path.join(self.modules_dir, module_name, "profiles.json")
+            keys[path] = stat_key(path)
+        return keys
+
+    def refresh(self, force: bool = False) -> None:
+        """Rescan the modules directory if it or any profiles.json changed."""
+        if not force and self._keys and (_SKIP_REVALIDATION.get() or self._current_keys() == self._keys):
+            return
+
+        modules: Dict[str, Dict[str, dict]] = {}
+        try:
+            entries = sorted(os.listdir(self.modules_dir))
+        except OSError as e:
+            PrintStyle().warning(f"⚠️ ProfileModuleIndex could not list {self.modules_dir}: {e}")
+            entries = []
+
+        for module_name in entries:
+            path = os.path.join(self.modules_dir, module_name, "profiles.json")
+            if not os.path.isfile(path):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as profiles_file:
+                    profiles = json.load(profiles_file)
+            except Exception as e:
+                PrintStyle().warning(f"⚠️ ProfileModuleIndex could not load {path}: {e}")
+                continue
+            if isinstance(profiles, dict):
+                modules[module_name] = {
+                    name: definition if isinstance(definition, dict) else {}
+                    for name, definition in profiles.items()
+                }
+
+        self._modules = modules
+        self._entries = entries
+        self._keys = self._current_keys()
+
+    def modules(self) -> List[str]:
+        """Names of all indexed profile modules."""
+        self.refresh()
+        return list(self._modules)
+
+    def has_module(self, module_name: str) -> bool:
+        self.refresh()
+        return module_name in self._modules
+
+    def get_profiles(self, module_name: str) -> Optional[List[str]]:
+        """Profile names of a module in profiles.json order, or None if not indexed."""
+        self.refresh()
+        profiles = self._modules.get(module_name)
+        return list(profiles) if profiles is not None else None
+
+    def has_profile(self, module_name: str, profile: str) -> bool:
+        self.refresh()
+        return profile in self._modules.get(module_name, {})
+
+    def get_features(self, module_name: str, profile: str) -> Dict[str, dict]:
+        """Feature definitions of a profile ({} if the module or profile is unknown)."""
+        self.refresh()
+        features = self._modules.get(module_name, {}).get(profile, {}).get("features", {})
+        return features if isinstance(features, dict) else {}
+
+    def validate(self, module_name: str, profile: str) -> Tuple[bool, List[str]]:
+        """Return (valid, available profiles); profiles of unindexed modules are always valid."""
+        available = self.get_profiles(module_name)
+        if available is None:
+            return True, []
+        return profile in self._modules[module_name], available
+
+
+def get_profile_index(modules_dir: str = PROFILE_MODULES_DIR) -> ProfileModuleIndex:
+    """Return the process-wide index for modules_dir, building it on first use."""
+    index = _INDEXES.get(modules_dir)
+    if index is None:
+        index = ProfileModuleIndex(modules_dir)
+        index.refresh(force=True)
+        _INDEXES[modules_dir] = index
+    return index
@@ -0,0 +1,269 @@
+"""ProfileLoader - Shared, memoized loader engine for profile modules
+
+Every profile module under control_layer/profile_modules/<module_name>/ has the
+same layout:
+
+    <module_name>.md        Prompt template using {{status}}, {{profile_content}}, ...
+    <module_name>.py        Thin VariablesPlugin delegating to ProfileLoader
+    profiles.json           Profile definitions and their features
+    profiles/<profile>.md   Profile content
+    features/<feature>.md   Feature content (or the feature's "reference" file)
+
+The rendered variables are memoized by (module, active profile, enabled features,
+source file stat keys, template kwargs). An unchanged turn costs one config
+snapshot, a stat per source file and a dictionary lookup; any edit to
+profiles.json or a profile/feature markdown file changes the key and re-renders.
+Files pulled in by {{ include }} inside those markdown files are not part of
+the key. On a miss, feature files are read concurrently on a shared thread pool
+and assembled in profiles.json order.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from python.helpers.print_style import PrintStyle
+from control_layer.python.helpers import prompt_budget, prompt_templates, segment_cache
+from control_layer.python.helpers.file_watcher import stat_key
+from control_layer.python.helpers.profile_index import get_profile_index
+
+
+# Rendered variables: cache key -> response dict (least recently used evicted)
+_RENDER_CACHE: "OrderedDict[tuple, Dict[str, str]]" = OrderedDict()
+RENDER_CACHE_SIZE = 64
+_RENDER_CACHE_LOCK = threading.Lock()
+
+# Shared pool for reading feature files concurrently on cache misses
+FEATURE_LOAD_WORKERS = 8
+_FEATURE_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_FEATURE_EXECUTOR_LOCK = threading.Lock()
+
+
+def _feature_executor() -> ThreadPoolExecutor:
+    """Return the shared feature loading pool, creating it on first use."""
+    global _FEATURE_EXECUTOR
+    with _FEATURE_EXECUTOR_LOCK:
+        if _FEATURE_EXECUTOR is None:
+            _FEATURE_EXECUTOR = ThreadPoolExecutor(
+                max_workers=FEATURE_LOAD_WORKERS, thread_name_prefix="profile-features"
+            )
+        return _FEATURE_EXECUTOR
+
+
+def _completed(fn: Callable, *args) -> Future:
+    """Run fn inline and wrap its result or exception in a Future."""
+    future: Future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+class ProfileLoader:
+    """Helper class for loading and managing profile data.
+
+    gate selects how the module is enabled: "control" checks the
+    "<module_name>_control" system control tool, "prompt_include" checks the
+    prompt-include named after the module (used by the reasoning modules).
+    """
+
+    def __init__(
+        self,
+        module_name: str,
+        module_title: str,
+        module_dir: Path,
+        gate: str = "control",
+        feature_info: bool = True,
+        profile_info: bool = True,
+    ):
+        self.system = None
+        self.snapshot = None
+        self.active_profile = "none"
+        self.features = {}
+        self.features_list = []
+        self.profile_content = ""
+        self.module_title = module_title
+        self.module_name = module_name
+        self.module_dir = Path(module_dir)
+        self.gate = gate
+        self.feature_info = feature_info  # Set to False to disable feature loading info
+        self.profile_info = profile_info  # Set to False to disable profile loading info
+
+    def get_variables(self, **kwargs) -> Dict[str, str]:
+        """Return the template variables for the module, rendering only on cache misses."""
+        # Initialize and check system control
+        if not self._initialize_system_control():
+            return {
+                "profile_content": self.profile_content,
+                "features_display": "(feature disabled)",
+                "status": "⛔ DISABLED"
+            }
+
+        # Load profile data; the cache key needs the active profile and features
+        self._load_profile_data()
+        key = self._cache_key(kwargs)
+        cached = None
+        if key is not None:
+            with _RENDER_CACHE_LOCK:
+                cached = _RENDER_CACHE.get(key)
+                if cached is not None:
+                    _RENDER_CACHE.move_to_end(key)
+        if cached is not None:
+            return self._apply_budget(dict(cached), kwargs)
+
+        # Load profile content and append feature content if needed
+        self._load_profile_content(**kwargs)
+        if self.features_list:
+            feature_content = self._load_feature_content(**kwargs)
+            if feature_content:
+                self.profile_content += feature_content
+
+        response = self.build_response()
+        if key is not None and self.active_profile != "error":
+            with _RENDER_CACHE_LOCK:
+                _RENDER_CACHE[key] = response
+                while len(_RENDER_CACHE) > RENDER_CACHE_SIZE:
+                    _RENDER_CACHE.popitem(last=False)
+        return self._apply_budget(dict(response), kwargs)
+
+    def _apply_budget(self, response: Dict[str, str], kwargs: dict) -> Dict[str, str]:
+        """Apply the module's prompt budget to the rendered profile content."""
+        response["profile_content"] = prompt_budget.apply_budget(
+            f"profile:{self.module_name}", response["profile_content"], kwargs.get("agent"), kind="profile", snapshot=self.snapshot
+        )
+        return response
+
+    def _initialize_system_control(self) -> bool:
+        """Initialize SystemControl and check if feature is enabled."""
+        try:
+            from control_layer.python.helpers.system_control import SystemControl
+            self.system = SystemControl()
+            self.snapshot = self.system.snapshot()
+
+            if self.gate == "prompt_include":
+                enabled = self.system.is_prompt_include_enabled(self.module_name, self.snapshot)
+                disabled_state = "profile is currently disabled"
+            else:
+                enabled = self.system.is_control_enabled(f"{self.module_name}_control", self.snapshot)
+                disabled_state = "Control is currently disabled"
+
+            if not enabled:
+                security_profile = self.system.get_active_profile("security", self.snapshot)
+                disabled_msg = f"⚠️ {self.module_title} {disabled_state} (Security profile: {security_profile})"
+                PrintStyle().hint(disabled_msg)
+                self.profile_content = f"# {self.module_title}\n\n{disabled_msg}\n\nPlease contact your system administrator to enable this feature."
+                return False
+            return True
+
+        except ImportError as e:
+            error_msg = f"❌ System Error: Could not load SystemControl module: {e}"
+            PrintStyle().error(error_msg)
+            self.profile_content = f"# {self.module_title}\n\n{error_msg}\n\nPlease ensure the SystemControl module is properly installed and configured."
+            return False
+
+    def _load_profile_data(self) -> None:
+        """Load the active profile and its features."""
+        if not self.system:
+            return
+
+        try:
+            self.active_profile = self.system.get_active_profile(self.module_name, self.snapshot)
+
+            # Profile metadata (including features) comes from the shared profiles.json index
+            index = get_profile_index(str(self.module_dir.parent))
+            self.features = index.get_features(self.module_dir.name, self.active_profile)
+            self.features_list = [f for f, cfg in self.features.items() if cfg.get("enabled")]
+
+        except Exception as e:
+            PrintStyle().warning(f"⚠️ {self.module_title} could not load profile settings: {e}")
+
+    def _profile_path(self) -> Path:
+        return self.module_dir / "profiles" / f"{self.active_profile}.md"
+
+    def _feature_path(self, feature: str) -> Path:
+        ref_file = self.features[feature].get('reference', f"{feature}.md")
+        return self.module_dir / "features" / ref_file
+
+    def _cache_key(self, kwargs: dict) -> Optional[tuple]:
+        """Build the render cache key, or None if kwargs cannot be keyed."""
+        kwargs_key = segment_cache.inputs_key(kwargs)
+        if kwargs_key is None:
+            return None
+        sources = [self.module_dir / "profiles.json", self._profile_path()]
+        sources += [self._feature_path(feature) for feature in self.features_list]
+        source_keys = tuple(stat_key(str(path)) for path in sources)
+        for path, key in zip(sources, source_keys):
+            segment_cache.record_file(str(path), key)
+        return (
+            self.module_name,
+            self.active_profile,
+            tuple(self.features_list),
+            source_keys,
+            kwargs_key,
+        )
+
+    def _load_profile_content(self, **kwargs) -> None:
+        """Load the content of the active profile."""
+        profile_path = self._profile_path()
+
+        try:
+            self.profile_content = prompt_templates.read_prompt_file(str(profile_path), _directories=[], **kwargs)
+            PrintStyle().info(f"{self.module_title} loaded: {self.active_profile}") if self.profile_info else None
+
+        except Exception as e:
+            error_msg = f"⚠️ {self.module_title} could not load profile '{self.active_profile}': {e}"
+            PrintStyle().warning(error_msg)
+            self.active_profile = "error"
+            self.profile_content = f"# {self.module_title}\n\n{error_msg}"
+
+    def _load_feature_content(self, **kwargs) -> str:
+        """Load content for all enabled features."""
+        if not self.features_list:
+            return ""
+
+        features_content = []
+        feature_paths = [self._feature_path(feature) for feature in self.features_list]
+
+        def read_feature(feature_path: Path) -> str:
+            return prompt_templates.read_prompt_file(str(feature_path), _directories=[], **kwargs)
+
+        # Read all feature files concurrently, then report results in feature order
+        if len(feature_paths) > 1:
+            futures = [_feature_executor().submit(read_feature, path) for path in feature_paths]
+        else:
+            futures = [_completed(read_feature, path) for path in feature_paths]
+
+        for feature, feature_path, future in zip(self.features_list, feature_paths, futures):
+            try:
+                content = future.result()
+                features_content.append(content)
+                if self.feature_info:
+                    PrintStyle().standard(f"  Loaded feature: {feature}")
+            except FileNotFoundError:
+                PrintStyle().warning(f"  Feature file not found: {feature_path}")
+            except Exception as e:
+                PrintStyle().warning(f"  Could not load feature '{feature}': {e}")
+
+        if not features_content:
+            return ""
+
+        features_display = ", ".join(self.features_list) if self.features_list else "(no features enabled)"
+        return f"\n\n## Active Features\n\n**Enabled:** {features_display}\n\n" + "\n\n".join(features_content)
+
+    def build_response(self) -> Dict[str, str]:
+        """Build the final response dictionary."""
+        features_display = ", ".join(self.features_list) if self.features_list else "(no features enabled)"
+
+        # Determine status display
+        if not self.features_list:
+            status = f"{self.active_profile.upper()} (no additional features)"
+        else:
+            status = f"{self.active_profile.upper()}"
+
+        return {
+            "profile_content": self.profile_content,
+            "features_display": features_display,
+            "status": status
+        }
@@ -0,0 +1,291 @@
+"""Prompt budget - Token accounting and budgets for system prompt segments
+
+Every control layer contribution to the system prompt is tagged with a source
+name and counted:
+
+    - "segment": text inserted by a system_prompt extension (pre_system_manual,
+      post_system_manual, post_behaviour, pre_behaviour, model_godmode,
+      system_ready)
+    - "include": prompt-include content (source = include name)
+    - "profile": profile module content (source = "profile:<module name>")
+
+Token counts use Agent Zero's approximate_tokens() (local tokenizer plus a
+safety buffer), or a 4-characters-per-token estimate when it is unavailable,
+and are cached per content hash. Counts are collected in a per-agent ledger
+that the _99_report_system_prompt_tokens extension turns into a report at the
+end of each system prompt build.
+
+Budgets come from the prompt_budgets section of system_control.json:
+
+    "prompt_budgets": {
+        "enabled": true,
+        "max_total_tokens": 12000,
+        "segments": {
+            "model_godmode": {"max_tokens": 1500, "on_exceed": "drop", "priority": 10},
+            "plinian_cognitive_matrix": {"max_tokens": 800, "on_exceed": "truncate"},
+            "profile:workflow_profile": {"max_tokens": 600}
+        }
+    }
+
+Budgets are resolved from one config snapshot per system prompt build: the
+pipeline registers it with begin_build(), and apply_budget() and
+finalize_report() read the budgets from it instead of loading the config per
+segment.
+
+A segment over its max_tokens is truncated (at a line boundary where possible)
+or dropped. When the whole system prompt exceeds max_total_tokens, segments
+with a priority are dropped lowest priority first until it fits: extension
+segments as a whole, includes and profiles by cutting their text out of the
+extension segment that contains them. Segments without a priority are never
+dropped.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from python.helpers.print_style import PrintStyle
+from control_layer.python.helpers import segment_cache
+
+try:
+    from python.helpers.tokens import approximate_tokens as _approximate_tokens
+except ImportError:  # older Agent Zero builds without the tokens helper
+    _approximate_tokens = None
+
+
+# Token counts: content hash -> tokens (least recently used evicted)
+_TOKEN_CACHE: "OrderedDict[str, int]" = OrderedDict()
+TOKEN_CACHE_SIZE = 1024
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+# Agent data keys
+LEDGER_KEY = "system_prompt_token_ledger"
+REPORT_KEY = "system_prompt_token_report"
+SNAPSHOT_KEY = "system_prompt_config_snapshot"
+
+TRUNCATION_MARKER = "\n\n[truncated to fit the prompt budget]"
+
+
+# ============================================================================
+# TOKEN COUNTING
+# ============================================================================
+
+def content_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+def _count_tokens_uncached(text: str) -> int:
+    """Approximate token count of text, bypassing the cache (for throwaway strings)."""
+    if _approximate_tokens is not None:
+        try:
+            return int(_approximate_tokens(text))
+        except Exception as e:
+            PrintStyle().warning(f"⚠️ Token counting failed, using character estimate: {e}")
+    return (len(text) + 3) // 4
+
+
+def count_tokens(text: str) -> int:
+    """Approximate token count of text, cached per content hash."""
+    if not text:
+        return 0
+    key = content_hash(text)
+    with _TOKEN_CACHE_LOCK:
+        tokens = _TOKEN_CACHE.get(key)
+        if tokens is not None:
+            _TOKEN_CACHE.move_to_end(key)
+            return tokens
+
+    tokens = _count_tokens_uncached(text)
+    with _TOKEN_CACHE_LOCK:
+        _TOKEN_CACHE[key] = tokens
+        while len(_TOKEN_CACHE) > TOKEN_CACHE_SIZE:
+            _TOKEN_CACHE.popitem(last=False)
+    return tokens
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to about max_tokens (marker included), preferring a line boundary."""
+    tokens = count_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    keep = max(max_tokens - count_tokens(TRUNCATION_MARKER), 0)
+    cut = len(text) * keep // tokens
+    # Prefixes are throwaway strings: count them without filling the token cache
+    while cut > 0 and _count_tokens_uncached(text[:cut]) > keep:
+        cut = cut * 9 // 10
+    line_end = text.rfind("\n", 0, cut)
+    if line_end > cut // 2:
+        cut = line_end
+    return text[:cut].rstrip() + TRUNCATION_MARKER
+
+
+# ============================================================================
+# LEDGER
+# ============================================================================
+
+def get_ledger(agent: Any) -> Dict[str, dict]:
+    """The agent's ledger of tagged segments for the system prompt being built."""
+    ledger = agent.get_data(LEDGER_KEY)
+    if ledger is None:
+        ledger = {}
+        agent.set_data(LEDGER_KEY, ledger)
+    return ledger
+
+
+def _record(agent: Any, source: str, kind: str, tokens: int, text: str, budget: Optional[dict], action: str) -> None:
+    if agent is None or not hasattr(agent, "get_data"):
+        return
+    priority = budget.get("priority") if budget else None
+    entry = {
+        "kind": kind,
+        "tokens": tokens,
+        "kept_tokens": count_tokens(text),
+        "action": action,
+        "priority": priority,
+        "hash": None,  # set for extension segments by budgeted_segment()
+    }
+    if kind != "segment" and priority is not None and text:
+        # Kept so _enforce_total_budget() can cut it out of its enclosing segment
+        entry["text"] = text
+    get_ledger(agent)[source] = entry
+
+
+def begin_build(agent: Any, snapshot: Any) -> None:
+    """Register the config snapshot budgets are read from while agent's system prompt is built."""
+    if agent is not None and hasattr(agent, "set_data"):
+        agent.set_data(SNAPSHOT_KEY, snapshot)
+
+
+def _build_snapshot(agent: Any, snapshot: Any = None) -> Any:
+    """snapshot, else the one registered by begin_build(), else the current config."""
+    if snapshot is None and agent is not None and hasattr(agent, "get_data"):
+        snapshot = agent.get_data(SNAPSHOT_KEY)
+    if snapshot is None:
+        from control_layer.python.helpers.system_control import get_system_control
+        snapshot = get_system_control().snapshot()
+    return snapshot
+
+
+def apply_budget(source: str, text: str, agent: Any = None, kind: str = "include", snapshot: Any = None) -> str:
+    """Count text, enforce the segment budget of source and record it in the agent's ledger.
+
+    Returns the text to use: unchanged, truncated or "" when dropped.
+    """
+    if not text:
+        return text
+    budget = None
+    try:
+        budget = _build_snapshot(agent, snapshot).get_segment_budget(source)
+        segment_cache.record_config("budget", source, budget)
+    except Exception as e:
+        PrintStyle().warning(f"⚠️ Could not read prompt budget for {source}: {e}")
+
+    tokens = count_tokens(text)
+    action = "kept"
+    if budget and budget["max_tokens"] and tokens > budget["max_tokens"]:
+        if budget["on_exceed"] == "drop":
+            text, action = "", "dropped"
+        else:
+            text, action = truncate_to_tokens(text, budget["max_tokens"]), "truncated"
+        PrintStyle().debug(f"Prompt budget: {source} {action} ({tokens} > {budget['max_tokens']} tokens)")
+
+    _record(agent, source, kind, tokens, text, budget, action)
+    return text
+
+
+def budgeted_segment(agent: Any, source: str, prompt: str) -> str:
+    """Apply the budget of an extension segment and return it padded for the system prompt."""
+    prompt = apply_budget(source, prompt, agent, kind="segment")
+    prompt_padded = '\n\n' + prompt + '\n\n' if prompt else ''
+    ledger_entry = get_ledger(agent).get(source) if hasattr(agent, "get_data") else None
+    if ledger_entry is not None:
+        ledger_entry["hash"] = content_hash(prompt_padded) if prompt_padded else None
+    return prompt_padded
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def _drop_nested(system_prompt: List[str], ledger: Dict[str, dict], text: str) -> Optional[int]:
+    """Cut an include or profile text out of the first part containing it; return the tokens saved."""
+    for index, part in enumerate(system_prompt):
+        if text not in part:
+            continue
+        old_hash = content_hash(part)
+        system_prompt[index] = part.replace(text, "", 1)
+        # The enclosing extension segment changed: keep its ledger hash locatable
+        for entry in ledger.values():
+            if entry["hash"] == old_hash:
+                entry["hash"] = content_hash(system_prompt[index])
+        return count_tokens(part) - count_tokens(system_prompt[index])
+    return None
+
+
+def _enforce_total_budget(system_prompt: List[str], ledger: Dict[str, dict], max_total_tokens: int) -> int:
+    """Drop prioritized segments (lowest priority first) until the prompt fits; return its tokens."""
+    total = sum(count_tokens(part) for part in system_prompt)
+    candidates = sorted(
+        (entry["priority"], source) for source, entry in ledger.items()
+        if entry["priority"] is not None and (entry["hash"] or entry.get("text"))
+    )
+    for _, source in candidates:
+        if total <= max_total_tokens:
+            break
+        entry = ledger[source]
+        saved = None
+        if entry["kind"] == "segment":
+            for index, part in enumerate(system_prompt):
+                if content_hash(part) == entry["hash"]:
+                    saved = count_tokens(part)
+                    del system_prompt[index]
+                    break
+        else:
+            saved = _drop_nested(system_prompt, ledger, entry["text"])
+        if saved is None:
+            continue
+        total -= saved
+        entry["action"] = "dropped"
+        entry["kept_tokens"] = 0
+        PrintStyle().debug(f"Prompt budget: {source} dropped to fit max_total_tokens={max_total_tokens}")
+    return total
+
+
+def finalize_report(agent: Any, system_prompt: List[str], snapshot: Any = None) -> dict:
+    """Enforce the total budget on system_prompt, store the token report on the agent and reset the ledger."""
+    ledger = get_ledger(agent)
+    budgets = {"enabled": False, "max_total_tokens": 0}
+    try:
+        budgets = _build_snapshot(agent, snapshot).get_prompt_budgets()
+    except Exception as e:
+        PrintStyle().warning(f"⚠️ Could not read prompt budgets: {e}")
+
+    if budgets["enabled"] and budgets["max_total_tokens"]:
+        total = _enforce_total_budget(system_prompt, ledger, budgets["max_total_tokens"])
+    else:
+        total = sum(count_tokens(part) for part in system_prompt)
+
+    segments = {
+        source: {key: value for key, value in entry.items() if key != "text"}
+        for source, entry in ledger.items()
+    }
+    tagged = sum(entry["kept_tokens"] for entry in segments.values() if entry["kind"] == "segment")
+    report = {
+        "total_tokens": total,
+        "untagged_tokens": max(total - tagged, 0),
+        "max_total_tokens": budgets["max_total_tokens"] if budgets["enabled"] else 0,
+        "segments": segments,
+    }
+
+    previous = agent.get_data(REPORT_KEY)
+    if previous is None or previous["total_tokens"] != total:
+        parts = ", ".join(
+            f"{source} {entry['kept_tokens']}" + (f" ({entry['action']})" if entry["action"] != "kept" else "")
+            for source, entry in segments.items() if entry["kind"] == "segment"
+        )
+        PrintStyle().info(f"System prompt: {total} tokens ({parts}, other {report['untagged_tokens']})")
+
+    agent.set_data(REPORT_KEY, report)
+    agent.set_data(LEDGER_KEY, {})
+    agent.set_data(SNAPSHOT_KEY, None)
+    return report
@@ -0,0 +1,367 @@
+"""PromptIncludeRegistry - Declarative prompt includes served by one engine
+
+Every prompt include under control_layer/prompt_includes/<include_dir>/ is
+described by a manifest instead of its own plugin code:
+
+    <include_dir>.md          Prompt template using {{prompt_include_content}}
+    <include_dir>.py          Stub VariablesPlugin, identical in every include
+    prompt_include.json       Manifest (see below)
+    <content files>           Content rendered into {{prompt_include_content}}
+
+Manifest fields:
+    - "name": include name used in log messages and segment cache keys
+    - "gate": SystemControl prompt-include entry that enables it (default: name)
+    - "content": content file, relative to the include directory
+    - "model_specific": when true, "content" is a pattern "{provider}/...{model}..."
+      resolved against the agent's chat model, e.g. "{provider}/{model}_overview.md"
+    - "default_model": model name used as the provider default (default: "default")
+    - "header": text prepended to non-empty content
+
+render_prompt_include() does the enable check, content path resolution and
+rendering for every include, through the segment cache and compiled templates,
+so adding an include is a data change. Manifests are indexed like profile
+modules: revalidated on access against the stat keys of the includes directory
+and every manifest.
+
+Model-specific content files are indexed per include (ModelContentIndex) and
+resolved through a fallback chain: exact model, longest model family prefix,
+provider default, none. Resolutions are cached per (provider, model); a model
+without content renders as an empty include instead of a "not found" message.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from python.helpers.print_style import PrintStyle
+from control_layer.python.helpers import prompt_budget, prompt_templates, segment_cache
+from control_layer.python.helpers.file_watcher import stat_key
+
+
+# control_layer/python/helpers/prompt_include_registry.py -> control_layer/prompt_includes
+PROMPT_INCLUDES_DIR = str(Path(__file__).resolve().parents[2] / "prompt_includes")
+MANIFEST_FILE = "prompt_include.json"
+
+# Characters that may follow a model family prefix ("gemini-2.5-pro" matches "gemini-2.5-pro-preview")
+MODEL_FAMILY_SEPARATORS = "-_.:@/ "
+
+_REGISTRIES: Dict[str, "PromptIncludeRegistry"] = {}
+
+
+class PromptIncludeRegistry:
+    """In-memory index: include directory name -> manifest."""
+
+    def __init__(self, includes_dir: str = PROMPT_INCLUDES_DIR):
+        self.includes_dir = includes_dir
+        self._manifests: Dict[str, dict] = {}
+        self._model_indexes: Dict[str, "ModelContentIndex"] = {}
+        self._keys: Dict[str, Optional[tuple]] = {}
+
+    def manifest_path(self, include_dir: str) -> str:
+        return os.path.join(self.includes_dir, include_dir, MANIFEST_FILE)
+
+    def _current_keys(self) -> Dict[str, Optional[tuple]]:
+        """Stat keys of the includes directory and every indexed manifest."""
+        keys = {self.includes_dir: stat_key(self.includes_dir)}
+        for include_dir in self._manifests:
+            path = self.manifest_path(include_dir)
+            keys[path] = stat_key(path)
+        return keys
+
+    def refresh(self, force: bool = False) -> None:
+        """Rescan the includes directory if it or any manifest changed."""
+        if not force and self._keys and self._current_keys() == self._keys:
+            return
+
+        manifests: Dict[str, dict] = {}
+        try:
+            entries = sorted(os.listdir(self.includes_dir))
+        except OSError as e:
+            PrintStyle().warning(f"⚠️ PromptIncludeRegistry could not list {self.includes_dir}: {e}")
+            entries = []
+
+        for include_dir in entries:
+            path = self.manifest_path(include_dir)
+            if not os.path.isfile(path):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as manifest_file:
+                    manifest = json.load(manifest_file)
+            except Exception as e:
+                PrintStyle().warning(f"⚠️ PromptIncludeRegistry could not load {path}: {e}")
+                continue
+            if not isinstance(manifest, dict) or not manifest.get("name") or not manifest.get("content"):
+                PrintStyle().warning(f"⚠️ PromptIncludeRegistry ignoring {path}: 'name' and 'content' are required")
+                continue
+            manifest.setdefault("gate", manifest["name"])
+            manifest.setdefault("model_specific", False)
+            manifest.setdefault("default_model", "default")
+            manifest.setdefault("header", "")
+            if manifest["model_specific"] and not _parse_model_pattern(manifest["content"]):
+                PrintStyle().warning(
+                    f"⚠️ PromptIncludeRegistry ignoring {path}: model-specific content must look like '{{provider}}/...{{model}}...'"
+                )
+                continue
+            manifests[include_dir] = manifest
+
+        self._manifests = manifests
+        self._model_indexes = {}
+        self._keys = self._current_keys()
+
+    def include_dirs(self) -> List[str]:
+        """Directory names of all registered prompt includes."""
+        self.refresh()
+        return list(self._manifests)
+
+    def get(self, include_dir: str) -> Optional[dict]:
+        """Manifest of the include in include_dir, or None if it has none."""
+        self.refresh()
+        return self._manifests.get(include_dir)
+
+    def find(self, name: str) -> Optional[dict]:
+        """Manifest of the include named name, or None."""
+        self.refresh()
+        for manifest in self._manifests.values():
+            if manifest["name"] == name:
+                return manifest
+        return None
+
+    def get_model_index(self, include_dir: str) -> Optional["ModelContentIndex"]:
+        """Model content index of a model-specific include, built on first use."""
+        manifest = self.get(include_dir)
+        if manifest is None or not manifest["model_specific"]:
+            return None
+        index = self._model_indexes.get(include_dir)
+        if index is None:
+            index = ModelContentIndex(
+                os.path.join(self.includes_dir, include_dir),
+                manifest["content"],
+                manifest["default_model"],
+            )
+            self._model_indexes[include_dir] = index
+        return index
+
+
+# ============================================================================
+# MODEL RESOLUTION
+# ============================================================================
+
+def _parse_model_pattern(pattern: str) -> Optional[Tuple[str, str]]:
+    """Split "{provider}/<prefix>{model}<suffix>" into (prefix, suffix), or None."""
+    if not pattern.startswith("{provider}/") or "{model}" not in pattern:
+        return None
+    prefix, _, suffix = pattern[len("{provider}/"):].partition("{model}")
+    if "{" in prefix + suffix:
+        return None
+    return prefix, suffix
+
+
+class ModelContentIndex:
+    """Index of one include's model-specific content files: provider -> {model: path}.
+
+    Built by walking the provider directories once; revalidated against the
+    stat keys of the include and provider directories (adding, removing or
+    renaming a content file changes them). Resolutions are cached per
+    (provider, model) until the index is rebuilt.
+    """
+
+    def __init__(self, include_path: str, pattern: str, default_model: str = "default"):
+        self.include_path = include_path
+        self.prefix, self.suffix = _parse_model_pattern(pattern)
+        self.default_model = default_model.lower()
+        self._models: Dict[str, Dict[str, str]] = {}
+        self._resolved: Dict[Tuple[str, str], Tuple[Optional[str], str]] = {}
+        self._keys: Dict[str, Optional[tuple]] = {}
+
+    def _current_keys(self) -> Dict[str, Optional[tuple]]:
+        """Stat keys of the include directory and every indexed directory below it."""
+        keys = {self.include_path: stat_key(self.include_path)}
+        for directory in self._keys:
+            keys[directory] = stat_key(directory)
+        return keys
+
+    def watch_paths(self) -> List[str]:
+        """Directories whose changes can alter resolution results."""
+        return list(self._keys)
+
+    def refresh(self) -> None:
+        """Rebuild the index if any indexed directory changed."""
+        if self._keys and self._current_keys() == self._keys:
+            return
+
+        models: Dict[str, Dict[str, str]] = {}
+        keys = {self.include_path: stat_key(self.include_path)}
+        try:
+            providers = sorted(os.listdir(self.include_path))
+        except OSError:
+            providers = []
+
+        for provider in providers:
+            provider_path = os.path.join(self.include_path, provider)
+            if not os.path.isdir(provider_path):
+                continue
+            for directory, _, filenames in os.walk(provider_path):
+                keys[directory] = stat_key(directory)
+                for filename in filenames:
+                    path = os.path.join(directory, filename)
+                    relative = os.path.relpath(path, provider_path).replace(os.sep, "/")
+                    if relative.startswith(self.prefix) and relative.endswith(self.suffix):
+                        model = relative[len(self.prefix):len(relative) - len(self.suffix)]
+                        if model:
+                            models.setdefault(provider.lower(), {})[model.lower()] = path
+
+        self._models = models
+        self._resolved = {}
+        self._keys = keys
+
+    def resolve(self, provider: str, model: str) -> Tuple[Optional[str], str]:
+        """Return (content path, match) for a chat model; match is "exact", "family", "default" or "none"."""
+        self.refresh()
+        key = (provider, model)
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            resolved = self._resolve(str(provider).lower(), str(model).lower())
+            self._resolved[key] = resolved
+        return resolved
+
+    def _resolve(self, provider: str, model: str) -> Tuple[Optional[str], str]:
+        models = self._models.get(provider, {})
+        if model in models:
+            return models[model], "exact"
+
+        family = [
+            name for name in models
+            if name != self.default_model
+            and model.startswith(name)
+            and model[len(name)] in MODEL_FAMILY_SEPARATORS
+        ]
+        if family:
+            return models[max(family, key=len)], "family"
+
+        if self.default_model in models:
+            return models[self.default_model], "default"
+        return None, "none"
+
+
+def get_prompt_include_registry(includes_dir: str = PROMPT_INCLUDES_DIR) -> PromptIncludeRegistry:
+    """Return the process-wide registry for includes_dir, building it on first use."""
+    registry = _REGISTRIES.get(includes_dir)
+    if registry is None:
+        registry = PromptIncludeRegistry(includes_dir)
+        registry.refresh(force=True)
+        _REGISTRIES[includes_dir] = registry
+    return registry
+
+
+# ============================================================================
+# RENDER ENGINE
+# ============================================================================
+
+def _chat_model(agent: Any) -> tuple:
+    """Return (provider, model name) of the agent's chat model, "unknown" without an agent."""
+    if agent and hasattr(agent, "config"):
+        return agent.config.chat_model.provider, agent.config.chat_model.name
+    return "unknown", "unknown"
+
+
+def _content_path(registry: PromptIncludeRegistry, include_path: Path, manifest: dict, agent: Any) -> Optional[str]:
+    """Content file of the include, or None if a model-specific include has none for the agent's model."""
+    if not manifest["model_specific"]:
+        return str(include_path / manifest["content"])
+
+    index = registry.get_model_index(include_path.name)
+    provider, model = _chat_model(agent)
+    path, match = index.resolve(provider, model)
+    for directory in index.watch_paths():
+        segment_cache.record_file(directory)
+    if match == "none":
+        PrintStyle().debug(f"{manifest['name']} has no content for {provider}/{model} - include left empty")
+    elif match != "exact":
+        PrintStyle().debug(f"{manifest['name']} using {match} content for {provider}/{model}")
+    return path
+
+
+def _render(include_path: Path, **kwargs) -> Dict[str, Any]:
+    """Render the include in include_path from its manifest (uncached)."""
+    registry = get_prompt_include_registry(str(include_path.parent))
+    segment_cache.record_file(registry.manifest_path(include_path.name))
+    manifest = registry.get(include_path.name)
+    if manifest is None:
+        PrintStyle().warning(f"⚠️ Prompt include '{include_path.name}' has no {MANIFEST_FILE}")
+        return {"prompt_include_content": ""}
+    prompt_include_name = manifest["name"]
+
+    # Check if prompt include is enabled via SystemControl
+    try:
+        from control_layer.python.helpers.system_control import SystemControl
+        system = SystemControl()
+        snapshot = system.snapshot()
+
+        if not system.is_prompt_include_enabled(manifest["gate"], snapshot):
+            PrintStyle().hint(
+                f"{prompt_include_name} prompt include DISABLED - Security profile: {system.get_active_profile('security', snapshot)}"
+            )
+            return {"prompt_include_content": ""}
+
+    except ImportError:
+        PrintStyle().hint(f"SystemControl not available - {prompt_include_name} disabled by default")
+        return {"prompt_include_content": ""}
+    except Exception as e:
+        PrintStyle().hint(f"Error checking {prompt_include_name} include: {e}")
+        segment_cache.mark_uncacheable()
+        return {"prompt_include_content": ""}
+
+    prompt_include_path = _content_path(registry, include_path, manifest, kwargs.get("agent"))
+    if prompt_include_path is None:
+        return {"prompt_include_content": ""}
+    try:
+        prompt_include_content = prompt_templates.read_prompt_file(
+            prompt_include_path,
+            _directories=[],
+            **kwargs,
+        )
+        if prompt_include_content and manifest["header"]:
+            prompt_include_content = manifest["header"] + prompt_include_content
+        PrintStyle().info(
+            f"✓ {prompt_include_name} prompt include ENABLED - loaded from {prompt_include_path}"
+        )
+    except FileNotFoundError:
+        PrintStyle().hint(f"{prompt_include_name} content file not found: {prompt_include_path}")
+        # Deterministic: cache the placeholder until the file appears
+        segment_cache.record_file(str(prompt_include_path))
+        prompt_include_content = f"({prompt_include_name} content file not found: {prompt_include_path})"
+    except Exception as e:
+        PrintStyle().error(f"Error loading {prompt_include_name} content '{prompt_include_path}': {e}")
+        segment_cache.mark_uncacheable()
+        prompt_include_content = f"(Error loading {prompt_include_name} content: {prompt_include_path})"
+
+    return {
+        "prompt_include_content": prompt_include_content
+    }
+
+
+def render_prompt_include(
+    include_path: Path,
+    file: str,
+    backup_dirs: Optional[List[str]] = None,
+    **kwargs,
+) -> Dict[str, Any]:
+    """Variables for the prompt include in include_path (entry point of the stub plugins).
+
+    Re-rendered only when the config lookups, files or agent model it depends on change;
+    the include's prompt budget is applied to the (cached) result on every call.
+    """
+    include_path = Path(include_path)
+    variables = segment_cache.cached_variables(
+        f"prompt_include:{include_path.name}",
+        file,
+        backup_dirs,
+        kwargs,
+        lambda: _render(include_path, **kwargs),
+    )
+    manifest = get_prompt_include_registry(str(include_path.parent)).get(include_path.name)
+    if manifest is not None and variables.get("prompt_include_content"):
+        variables["prompt_include_content"] = prompt_budget.apply_budget(
+            manifest["name"], variables["prompt_include_content"], kwargs.get("agent")
+        )
+    return variables
@@ -0,0 +1,78 @@
+"""Prompt order - Prefix-cache-friendly ordering of system prompt segments
+
+The system_prompt extensions insert their segments at the front or the end in
+file order, so volatile content (profile and prompt-include state) ends up
+ahead of large static blocks and every profile switch changes the prompt
+prefix that providers cache.
+
+order_segments() runs after all segments are in place and stable-sorts the
+system prompt by volatility class:
+
+    0 static   framework prompt parts (untagged), the system manuals and
+               post_behaviour
+    1 model    content that changes only with the chat model (godmode)
+    2 profile  behaviour segments carrying profile and prompt-include content
+    3 pinned   segments that must stay last (system_ready)
+
+Segments are identified through the prompt_budget ledger (content hash per
+tagged segment); untagged parts are treated as static. Within a class the
+original order is kept, so the result is deterministic. post_behaviour only
+wraps the Plinian cognitive matrix, a large block that changes only when that
+include is toggled, so it belongs in the cached prefix rather than after the
+per-profile pre_behaviour. The stable prefix (all static parts) is
+fingerprinted every turn and stored on the agent, and a change of fingerprint
+is logged.
+"""
+
+from typing import Any, Dict, List
+from python.helpers.print_style import PrintStyle
+from control_layer.python.helpers import prompt_budget
+
+
+STATIC, MODEL, PROFILE, PINNED = 0, 1, 2, 3
+VOLATILITY_NAMES = {STATIC: "static", MODEL: "model", PROFILE: "profile", PINNED: "pinned"}
+
+# Volatility class of each tagged segment source; unknown tagged sources count as PROFILE
+SEGMENT_VOLATILITY: Dict[str, int] = {
+    "pre_system_manual": STATIC,
+    "post_system_manual": STATIC,
+    "model_godmode": MODEL,
+    "pre_behaviour": PROFILE,
+    "post_behaviour": STATIC,
+    "system_ready": PINNED,
+}
+
+# Agent data key of the last ordering result
+PREFIX_KEY = "system_prompt_prefix"
+
+
+def order_segments(agent: Any, system_prompt: List[str]) -> dict:
+    """Reorder system_prompt in place by volatility and return the prefix info stored on the agent."""
+    sources = {
+        entry["hash"]: source
+        for source, entry in prompt_budget.get_ledger(agent).items()
+        if entry["kind"] == "segment" and entry["hash"]
+    }
+
+    classified = []
+    for index, part in enumerate(system_prompt):
+        source = sources.get(prompt_budget.content_hash(part)) if part else None
+        volatility = STATIC if source is None else SEGMENT_VOLATILITY.get(source, PROFILE)
+        classified.append((volatility, index, source or "framework", part))
+    classified.sort(key=lambda item: (item[0], item[1]))
+    system_prompt[:] = [part for _, _, _, part in classified]
+
+    prefix = [part for volatility, _, _, part in classified if volatility == STATIC]
+    info = {
+        "fingerprint": prompt_budget.content_hash("".join(prefix)),
+        "prefix_tokens": sum(prompt_budget.count_tokens(part) for part in prefix),
+        "order": [(source, VOLATILITY_NAMES[volatility]) for volatility, _, source, part in classified if part],
+    }
+
+    previous = agent.get_data(PREFIX_KEY)
+    if previous is not None and previous["fingerprint"] != info["fingerprint"]:
+        PrintStyle().debug(
+            f"System prompt stable prefix changed ({previous['prefix_tokens']} -> {info['prefix_tokens']} tokens)"
+        )
+    agent.set_data(PREFIX_KEY, info)
+    return info
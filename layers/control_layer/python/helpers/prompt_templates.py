@@ -0,0 +1,175 @@
+"""Compiled prompt templates for control layer markdown files
+
+Drop-in replacement for files.read_prompt_file() used by the control layer's
+VariablesPlugin classes (profile modules and prompt includes). Each file is
+parsed once into literal, placeholder and include segments, cached by path and
+stat key, and rendered by joining segments:
+
+    - literal text is emitted as-is
+    - {{name}} is replaced like Agent Zero does (str(), or JSON for dicts/lists);
+      placeholders without a matching kwarg are left in place
+    - {{ include "path" }} is delegated to files.read_prompt_file() with the
+      file's directory first in the search path, so included templates keep
+      their VariablesPlugin and search-path behaviour
+
+Anything the compiler does not fully understand falls back to
+files.read_prompt_file() unchanged: relative paths (resolved through the
+directory search), files with a sibling .py plugin, any other {{ ... }} syntax,
+and kwargs whose string values contain "{{" (which Agent Zero would expand).
+
+While a segment_cache segment is being computed, every file checked (including
+include targets and their plugins) is recorded as a dependency of it;
+record_include_tree() does the same for a whole include tree rendered elsewhere.
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from python.helpers import files
+from control_layer.python.helpers.file_watcher import stat_key
+from control_layer.python.helpers import segment_cache
+
+
+LITERAL = 0
+PLACEHOLDER = 1
+INCLUDE = 2
+
+_TOKEN = re.compile(r"{{(.*?)}}", re.S)
+_PLACEHOLDER = re.compile(r"\w+")
+_INCLUDE = re.compile(r"\s*include\s*['\"](.*?)['\"]\s*")
+
+# Compiled templates: absolute path -> (validation key, segments or None for fallback)
+_TEMPLATE_CACHE: Dict[str, Tuple[tuple, Optional[List[Tuple[int, str]]]]] = {}
+
+# Include targets per file: absolute path -> (stat key, include paths)
+_INCLUDE_CACHE: Dict[str, Tuple[Optional[tuple], List[str]]] = {}
+
+
+def compile_template(content: str) -> Optional[List[Tuple[int, str]]]:
+    """Split content into (kind, value) segments, or None if it uses unsupported syntax."""
+    segments: List[Tuple[int, str]] = []
+    position = 0
+    for match in _TOKEN.finditer(content):
+        if match.start() > position:
+            segments.append((LITERAL, content[position:match.start()]))
+        token = match.group(1)
+        include = _INCLUDE.fullmatch(token)
+        if _PLACEHOLDER.fullmatch(token):
+            segments.append((PLACEHOLDER, token))
+        elif include:
+            segments.append((INCLUDE, include.group(1)))
+        else:
+            return None
+        position = match.end()
+    if position < len(content):
+        segments.append((LITERAL, content[position:]))
+    return segments
+
+
+def _format_value(value: Any) -> str:
+    return json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+
+
+def _get_segments(path: str, encoding: str) -> Optional[List[Tuple[int, str]]]:
+    """Return the compiled segments of path, recompiling when the file changed."""
+    plugin_path = os.path.splitext(path)[0] + ".py"
+    key = (stat_key(path), os.path.exists(plugin_path))
+    cached = _TEMPLATE_CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    if key[0] is None:
+        raise FileNotFoundError(f"Prompt file not found: {path}")
+    if key[1]:
+        segments = None
+    else:
+        with open(path, "r", encoding=encoding) as template_file:
+            segments = compile_template(template_file.read())
+    _TEMPLATE_CACHE[path] = (key, segments)
+    return segments
+
+
+def _record_resolution(file: str, directories: List[str]) -> Optional[str]:
+    """Record the files Agent Zero's directory search checks for file, up to the match.
+
+    Each candidate and its sibling .py plugin become segment dependencies, so a
+    file appearing earlier in the search path also invalidates the segment.
+    Returns the matched path, or None if nothing matched or nothing is recording.
+    """
+    if not segment_cache.is_recording():
+        return None
+    if os.path.dirname(file):
+        directories = [os.path.dirname(file)] + directories
+        file = os.path.basename(file)
+    for directory in directories:
+        path = files.get_abs_path(directory, file)
+        key = stat_key(path)
+        segment_cache.record_file(path, key)
+        segment_cache.record_file(os.path.splitext(path)[0] + ".py")
+        if key is not None:
+            return path
+    return None
+
+
+def _include_targets(path: str) -> List[str]:
+    """Include paths referenced by the file at path, cached by stat key."""
+    key = stat_key(path)
+    cached = _INCLUDE_CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    try:
+        with open(path, "r", encoding="utf-8") as template_file:
+            content = template_file.read()
+    except OSError:
+        return []
+    targets = [m.group(1) for m in map(_INCLUDE.fullmatch, _TOKEN.findall(content)) if m]
+    _INCLUDE_CACHE[path] = (key, targets)
+    return targets
+
+
+def record_include_tree(file: str, directories: List[str], _seen: Optional[set] = None) -> None:
+    """Record file and every file it includes, recursively, as segment dependencies.
+
+    Used for files rendered by Agent Zero itself (e.g. agent.read_prompt), whose
+    include resolution the compiled renderer never sees.
+    """
+    if not segment_cache.is_recording():
+        return
+    seen = _seen if _seen is not None else set()
+    path = _record_resolution(file, directories)
+    if path is None or path in seen:
+        return
+    seen.add(path)
+    include_directories = [os.path.dirname(path)] + directories
+    for target in _include_targets(path):
+        record_include_tree(target, include_directories, seen)
+
+
+def read_prompt_file(
+    _file: str,
+    _directories: Optional[List[str]] = None,
+    _encoding: str = "utf-8",
+    **kwargs,
+) -> str:
+    """Render a prompt file like files.read_prompt_file(), from a compiled template when possible."""
+    directories = list(_directories or [])
+    _record_resolution(_file, directories)
+    if not os.path.isabs(_file) or any(isinstance(v, str) and "{{" in v for v in kwargs.values()):
+        return files.read_prompt_file(_file, _directories=directories, _encoding=_encoding, **kwargs)
+
+    segments = _get_segments(_file, _encoding)
+    if segments is None:
+        return files.read_prompt_file(_file, _directories=directories, _encoding=_encoding, **kwargs)
+
+    include_directories = [os.path.dirname(_file)] + directories
+    parts = []
+    for kind, value in segments:
+        if kind == LITERAL:
+            parts.append(value)
+        elif kind == PLACEHOLDER:
+            parts.append(_format_value(kwargs[value]) if value in kwargs else "{{" + value + "}}")
+        else:
+            _record_resolution(value, include_directories)
+            parts.append(files.read_prompt_file(value, _directories=include_directories, **kwargs))
+    return "".join(parts)
@@ -0,0 +1,240 @@
+"""Segment cache - Dependency-tracked memoization of rendered prompt segments
+
+A segment is any expensive control layer render (for example a prompt include's
+variables). cached_segment() runs the render once and records every input it
+touched while running:
+
+    - declared inputs: passed by the caller and part of the cache key (template
+      kwargs, the agent's chat model and profile, ...)
+    - config dependencies: SystemControl queries made during the render
+      ("active" profile lookups, "permission" entries, "control" tools,
+      "budget" segment budgets)
+    - file dependencies: files read or resolved by prompt_templates and the
+      profile loader, with their stat keys
+
+On the next call the segment is reused if its config dependencies still
+evaluate to the recorded values (skipped entirely while the config snapshot is
+unchanged) and none of its files changed; otherwise only that segment is
+recomputed. Dependencies are recorded per thread/task through a context
+variable, and a segment rendered inside another one adds its dependencies to
+the outer segment as well.
+"""
+
+import copy
+import json
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from control_layer.python.helpers.file_watcher import stat_key
+
+
+# Cached segments: (name, inputs key) -> SegmentEntry (least recently used evicted)
+_SEGMENTS: "OrderedDict[Tuple[str, str], SegmentEntry]" = OrderedDict()
+SEGMENT_CACHE_SIZE = 256
+# Guards _SEGMENTS: renders run on several threads and LRU upkeep mutates the order
+_SEGMENTS_LOCK = threading.Lock()
+
+# Dependency kinds evaluated against a ConfigSnapshot
+_CONFIG_EVALUATORS: Dict[str, Callable[[Any, str], Any]] = {
+    "active": lambda snapshot, key: snapshot.get_active(key),
+    "permission": lambda snapshot, key: snapshot.get_entry_enabled_and_source(key),
+    "control": lambda snapshot, key: snapshot.is_control_enabled(key),
+    "budget": lambda snapshot, key: snapshot.get_segment_budget(key),
+}
+
+
+@dataclass
+class SegmentEntry:
+    """A rendered segment with the dependencies recorded while computing it."""
+    result: Any = None
+    snapshot: Any = None
+    config_deps: Dict[Tuple[str, str], Any] = field(default_factory=dict)
+    file_deps: Dict[str, Optional[tuple]] = field(default_factory=dict)
+    cacheable: bool = True
+
+
+_RECORDER: ContextVar[Optional[SegmentEntry]] = ContextVar("control_layer_segment_recorder", default=None)
+
+
+# ============================================================================
+# RECORDING
+# ============================================================================
+
+def record_config(kind: str, key: str, value: Any) -> None:
+    """Record a config dependency of the segment being computed (no-op outside one)."""
+    entry = _RECORDER.get()
+    if entry is not None and (kind, key) not in entry.config_deps:
+        entry.config_deps[(kind, key)] = value
+
+
+def record_file(path: str, key: Optional[tuple] = None) -> None:
+    """Record a file dependency (missing files included) of the segment being computed."""
+    entry = _RECORDER.get()
+    if entry is not None and path not in entry.file_deps:
+        entry.file_deps[path] = key if key is not None else stat_key(path)
+
+
+def mark_uncacheable() -> None:
+    """Keep the segment being computed (and any enclosing one) out of the cache, e.g. after an error."""
+    entry = _RECORDER.get()
+    if entry is not None:
+        entry.cacheable = False
+
+
+def is_recording() -> bool:
+    """True while a segment is being computed in the current context."""
+    return _RECORDER.get() is not None
+
+
+def inputs_key(kwargs: Dict[str, Any]) -> Optional[str]:
+    """Cache key of render kwargs: the agent object is replaced by agent_inputs().
+
+    Keying on the agent itself would embed its repr (a memory address), splitting
+    the cache per agent instance and letting a new agent at a reused address hit
+    a dead agent's entries. Returns None if kwargs cannot be serialized.
+    """
+    inputs = {name: value for name, value in kwargs.items() if name != "agent"}
+    inputs.update(agent_inputs(kwargs.get("agent")))
+    try:
+        return json.dumps(inputs, sort_keys=True, default=repr)
+    except (TypeError, ValueError):
+        return None
+
+
+def agent_inputs(agent: Any) -> Dict[str, Any]:
+    """Declared inputs describing the agent: chat model provider/name and agent profile."""
+    config = getattr(agent, "config", None)
+    chat_model = getattr(config, "chat_model", None)
+    return {
+        "chat_model_provider": getattr(chat_model, "provider", None),
+        "chat_model_name": getattr(chat_model, "name", None),
+        "agent_profile": getattr(config, "profile", None),
+    }
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+def _current_snapshot() -> Any:
+    from control_layer.python.helpers.system_control import get_system_control
+    return get_system_control().snapshot()
+
+
+def _is_valid(entry: SegmentEntry, snapshot: Any = None) -> bool:
+    """Check the recorded file and config dependencies of entry against current state."""
+    for path, key in entry.file_deps.items():
+        if stat_key(path) != key:
+            return False
+
+    if not entry.config_deps:
+        return True
+    snapshot = snapshot or _current_snapshot()
+    if snapshot is entry.snapshot:
+        return True
+    for (kind, key), value in entry.config_deps.items():
+        if _CONFIG_EVALUATORS[kind](snapshot, key) != value:
+            return False
+    entry.snapshot = snapshot
+    return True
+
+
+def _propagate(entry: SegmentEntry) -> None:
+    """Add entry's dependencies to the enclosing segment, if any."""
+    outer = _RECORDER.get()
+    if outer is None:
+        return
+    outer.cacheable = outer.cacheable and entry.cacheable
+    for dep, value in entry.config_deps.items():
+        outer.config_deps.setdefault(dep, value)
+    for path, key in entry.file_deps.items():
+        outer.file_deps.setdefault(path, key)
+
+
+def cached_segment(
+    name: str, inputs: Dict[str, Any], compute: Callable[[], Any], snapshot: Any = None
+) -> Any:
+    """Return compute()'s result for (name, inputs), recomputing only when a dependency changed.
+
+    Config dependencies are checked against snapshot, or the current config when None.
+
+    Results are deep-copied on the way in and out, so callers may modify them.
+    If inputs cannot be serialized into a key, or compute() called mark_uncacheable(),
+    the result is not cached.
+    """
+    try:
+        key = (name, json.dumps(inputs, sort_keys=True, default=repr))
+    except (TypeError, ValueError):
+        return compute()
+
+    with _SEGMENTS_LOCK:
+        entry = _SEGMENTS.get(key)
+    if entry is not None and reuse_entry(entry, snapshot):
+        with _SEGMENTS_LOCK:
+            if key in _SEGMENTS:
+                _SEGMENTS.move_to_end(key)
+        return copy.deepcopy(entry.result)
+
+    result, entry = run_recorded(compute)
+    if entry.cacheable:
+        entry.result = copy.deepcopy(result)
+        with _SEGMENTS_LOCK:
+            _SEGMENTS[key] = entry
+            while len(_SEGMENTS) > SEGMENT_CACHE_SIZE:
+                _SEGMENTS.popitem(last=False)
+    return result
+
+
+def run_recorded(compute: Callable[[], Any]) -> Tuple[Any, SegmentEntry]:
+    """Run compute() and return its result with the dependencies it recorded.
+
+    For caches kept outside this module: store the entry next to the result and
+    check it with reuse_entry(). The dependencies also count for the enclosing
+    segment, if any.
+    """
+    entry = SegmentEntry()
+    token = _RECORDER.set(entry)
+    try:
+        result = compute()
+    finally:
+        _RECORDER.reset(token)
+    _propagate(entry)
+    return result, entry
+
+
+def reuse_entry(entry: SegmentEntry, snapshot: Any = None) -> bool:
+    """True if entry's dependencies are unchanged; they then count for the enclosing segment."""
+    if not entry.cacheable or not _is_valid(entry, snapshot):
+        return False
+    _propagate(entry)
+    return True
+
+
+def cached_variables(
+    name: str,
+    file: str,
+    backup_dirs: Optional[List[str]],
+    kwargs: Dict[str, Any],
+    compute: Callable[[], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """cached_segment() for a VariablesPlugin: keyed by file, kwargs and the agent's model and profile."""
+    kwargs_key = inputs_key(kwargs)
+    if kwargs_key is None:
+        return compute()
+    inputs = {"file": file, "backup_dirs": backup_dirs, "kwargs": kwargs_key}
+    return cached_segment(name, inputs, compute)
+
+
+def invalidate(name: Optional[str] = None) -> None:
+    """Drop cached segments named name, or all of them."""
+    with _SEGMENTS_LOCK:
+        for key in [k for k in _SEGMENTS if name is None or k[0] == name]:
+            del _SEGMENTS[key]
+
+
+def cached_segments() -> List[str]:
+    """Names of the currently cached segments (for diagnostics)."""
+    with _SEGMENTS_LOCK:
+        return [name for name, _ in _SEGMENTS]
@@ -4,13 +4,37 @@ This module provides a simplified, flat approach to managing system profiles and
 prompt-includes/system control tools.
 
 Architecture:
-    - ConfigStore: File I/O operations (no caching, always current)
+    - ConfigStore: File I/O operations (stat-validated parse and snapshot cache, always current;
+      atomic, lock-protected, versioned writes); alternative backends such as
+      JournalConfigStore (config_journal) and SqliteConfigStore (config_sqlite) are
+      selected via SYSTEM_CONTROL_BACKEND
+    - ConfigSnapshot: Immutable view of one config read used to answer queries
     - ProfileManager: Flat profile operations using prompt_modules section
+    - ConfigChangeNotifier: Watches the control and override files (inotify or polling)
+      and tells subscribers which config sections changed
+    - AsyncSystemControl: Coroutine facade for async tools and extensions; queries are
+      served from an in-memory snapshot, writes and cold loads run in a worker thread
 
 Design Principles:
     - Flat structure: All profiles use prompt_modules section with module names
-    - No external profile loading: Features read from profiles.json by profile loaders
-    - No caching: Always reads fresh config
+    - No external profile loading: Features read from profiles.json by profile loaders;
+      a ProfileModuleIndex of those files lists and validates module profiles
+    - Always fresh: The shared parse and snapshot cache is revalidated against the file's
+      stat on every call, so unchanged configs are neither re-parsed nor re-compiled
+    - One read per query: Composite queries resolve everything from a single ConfigSnapshot
+    - Compiled permissions: Entry precedence is resolved once per snapshot into a flat table
+    - Safe concurrent writes: Read-modify-write runs under an flock writer lock and
+      replaces the file atomically; readers never lock and never see partial files
+    - Change notifications: Caches subscribe via SystemControl.subscribe() and
+      invalidate only when a section they depend on changes
+    - Dependency recording: Profile and prompt-include lookups are recorded for
+      the segment cache, which re-renders only segments whose lookups changed
+    - Prompt budgets: prompt_budgets limits the tokens of system prompt segments
+      (enforced by the prompt_budget helper)
+    - Presets: named bundles of profile and prompt-include settings, compiled and
+      validated per snapshot and applied with one validated write (apply_preset)
+    - Message loop extras: system_control_extras.mode selects whether the extras
+      block is injected every turn ("full") or only when it changed ("delta")
     - No nested keys: Reasoning profiles treated like other module-based profiles
     - Single responsibility: Each class has one clear purpose
 
@@ -20,58 +44,278 @@ Profile Storage:
     - Security profile: Special case with no module_name, stored in security section
 """
 
+import asyncio
+import copy
+import hashlib
+import importlib
+import inspect
 import json
 import os
-from typing import Dict, List
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from python.helpers import files
 from python.helpers.print_style import PrintStyle
+from control_layer.python.helpers.file_watcher import FileWatcher, stat_key
+from control_layer.python.helpers.profile_index import ProfileModuleIndex, get_profile_index, revalidation_skipped
+from control_layer.python.helpers.segment_cache import record_config
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX development hosts: writes stay atomic but unlocked
+    fcntl = None
 
 
 CONTROL_FILE = "/a0/tmp/system_control.json"
 ADMIN_OVERRIDE_FILE = "/a0/tmp/admin_override.lock"
 
+# Parsed configs shared by all ConfigStore instances in this process:
+# config_path -> ((st_mtime_ns, st_size, st_ino), parsed config)
+_CONFIG_CACHE: Dict[str, Tuple[tuple, dict]] = {}
+
+# Last snapshot per config path, reused while the cached config and override state
+# are unchanged so that its compiled tables are built once per config version.
+_SNAPSHOT_CACHE: Dict[str, "ConfigSnapshot"] = {}
+
+# Last observed admin override lock file state per path: stat key, or None when
+# absent. Used to log override transitions once instead of on every lookup.
+_OVERRIDE_STATE: Dict[str, Optional[tuple]] = {}
+
+# Last reported validation errors per preset name, to warn only when they change
+_REPORTED_PRESET_ERRORS: Dict[str, Tuple[str, ...]] = {}
+
+# Message loop extras modes: inject the block every turn, or only when it changed
+EXTRAS_MODES = ("full", "delta")
+
+# Config storage backends selectable with SYSTEM_CONTROL_BACKEND:
+# name -> (module, class). Modules are imported on first use.
+CONFIG_BACKENDS: Dict[str, Tuple[str, str]] = {
+    "json": (__name__, "ConfigStore"),
+    "journal": ("control_layer.python.helpers.config_journal", "JournalConfigStore"),
+    "sqlite": ("control_layer.python.helpers.config_sqlite", "SqliteConfigStore"),
+}
+
+# One change notifier per (config_path, admin_override_path) in this process
+_NOTIFIERS: Dict[Tuple[str, str], "ConfigChangeNotifier"] = {}
+_NOTIFIERS_LOCK = threading.Lock()
+
+# Seconds between stat checks when inotify is unavailable
+WATCH_POLL_INTERVAL = 1.0
+
+# Seconds an AsyncSystemControl answers from memory before revalidating in a worker thread
+ASYNC_REVALIDATE_INTERVAL = 1.0
+
+# Shared SystemControl per control environment (see get_system_control())
+_SYSTEMS: Dict[tuple, "SystemControl"] = {}
+_SYSTEMS_LOCK = threading.Lock()
+
+# One AsyncSystemControl per (config_path, admin_override_path) in this process
+_ASYNC_FACADES: Dict[Tuple[str, str], "AsyncSystemControl"] = {}
+_ASYNC_FACADES_LOCK = threading.Lock()
+
 
 # ============================================================================
 # STORAGE LAYER
 # ============================================================================
 
 class ConfigStore:
-    """Handles all file I/O operations for system configuration (no caching)."""
+    """Handles all file I/O operations for system configuration.
+
+    Parsed configs are shared between instances and only re-parsed when the file's
+    (st_mtime_ns, st_size, st_ino) changes, so reads stay exactly as fresh as
+    uncached ones. The returned dict is shared and must be treated as read-only.
+
+    Writes go to a temp file that is fsynced and renamed over the config, while
+    holding an exclusive flock on "<config_path>.lock". Every write increments
+    the top-level "config_version" field; save() can compare-and-swap on it and
+    update() performs a whole read-modify-write under the lock.
+    """
     
     def __init__(self, config_path: str, admin_override_path: str):
         self.config_path = config_path
         self.admin_override_path = admin_override_path
     
+    def _stat_key(self) -> Optional[tuple]:
+        """Return the cache validation key for the config file, or None if it is missing."""
+        return stat_key(self.config_path)
+    
+    def watch_paths(self) -> List[str]:
+        """Files whose changes can alter snapshot() results."""
+        return [self.config_path, self.admin_override_path]
+    
     def load(self) -> dict:
-        """Load configuration from disk (always fresh, no caching)."""
+        """Load configuration from disk (always fresh, cached parse reused when unchanged)."""
+        key = self._stat_key()
+        cached = _CONFIG_CACHE.get(self.config_path)
+        if key is not None and cached is not None and cached[0] == key:
+            return cached[1]
+
+        config = self._read_config()
+        if config is None:
+            PrintStyle().warning(f"⚠️ ConfigStore using defaults - config file not found or unreadable")
+            return self._get_default_config()
+
+        if key is not None:
+            # Stat was taken before the read, so a concurrent write can only
+            # make the stored key older than the content and force a re-parse.
+            _CONFIG_CACHE[self.config_path] = (key, config)
+        return config
+    
+    def _read_config(self) -> Optional[dict]:
+        """Read and parse the config file; None if it is missing or unreadable."""
         try:
             if files.exists(self.config_path):
                 content = files.read_file(self.config_path)
-                config = json.loads(content)
-                return config
+                return json.loads(content)
             else:
                 PrintStyle().warning(f"⚠️ Config file does not exist: {self.config_path}")
         except Exception as e:
             PrintStyle().error(f"❌ ConfigStore error reading {self.config_path}: {e}")
+        return None
+    
+    def snapshot(self) -> "ConfigSnapshot":
+        """Read the configuration and admin override state once into a ConfigSnapshot.
 
-        PrintStyle().warning(f"⚠️ ConfigStore using defaults - config file not found or unreadable")
-        return self._get_default_config()
+        The previous snapshot is returned again while the cached parse is reused
+        and the override state is unchanged, keeping its compiled tables (such as
+        permissions).
+        """
+        config = self.load()
+        admin_override = self.has_admin_override()
+
+        cached = _SNAPSHOT_CACHE.get(self.config_path)
+        if cached is not None and cached.config is config and cached.admin_override == admin_override:
+            return cached
+        snapshot = ConfigSnapshot(config=config, admin_override=admin_override)
+        _SNAPSHOT_CACHE[self.config_path] = snapshot
+        return snapshot
     
-    def save(self, config: dict) -> bool:
-        """Save configuration to disk."""
+    @contextmanager
+    def write_lock(self) -> Iterator[None]:
+        """Hold the exclusive writer lock shared by all processes using this config."""
+        if fcntl is None:
+            yield
+            return
+        lock_path = self.config_path + ".lock"
+        os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+        with open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def save(self, config: dict, expected_version: Optional[int] = None) -> bool:
+        """Save configuration to disk atomically, bumping config_version.
+
+        When expected_version is given, the write only happens if the version on
+        disk still matches it (compare-and-swap); otherwise False is returned.
+        """
         try:
-            content = json.dumps(config, indent=2)
-            files.write_file(self.config_path, content)
-            return True
+            with self.write_lock():
+                current = self.load()
+                current_version = ConfigSnapshot(config=current).version
+                if expected_version is not None and current_version != expected_version:
+                    PrintStyle().warning(
+                        f"⚠️ ConfigStore write rejected: config_version is {current_version}, expected {expected_version}"
+                    )
+                    return False
+                return self._save_locked(config, current)
         except Exception as e:
             PrintStyle().error(f"❌ ConfigStore write error: {e}")
             return False
+
+    def update(self, mutate: Callable[["ConfigSnapshot", dict], Tuple[bool, dict]]) -> dict:
+        """Run a read-modify-write cycle under the writer lock.
+
+        mutate(snapshot, config) receives a fresh snapshot and a private mutable
+        copy of its config, and returns (changed, result). The config is written
+        only when changed is True; result is returned to the caller unchanged,
+        or replaced by an error result if the write fails.
+        """
+        try:
+            with self.write_lock():
+                snapshot = self.snapshot()
+                config = snapshot.mutable_config()
+                changed, result = mutate(snapshot, config)
+                if changed:
+                    self._save_locked(config, snapshot.config)
+                return result
+        except Exception as e:
+            PrintStyle().error(f"❌ ConfigStore write error: {e}")
+            return {"success": False, "error": "Failed to write configuration"}
+
+    def _save_locked(self, config: dict, current: dict) -> bool:
+        """Write config with the version after current's; the caller must hold write_lock().
+
+        current is the config the caller loaded under the same lock.
+        """
+        config["config_version"] = ConfigSnapshot(config=current).version + 1
+        content = json.dumps(config, indent=2)
+        self._write_atomic(content)
+        # Drop the cached parse; the rename also gives the file a new inode.
+        _CONFIG_CACHE.pop(self.config_path, None)
+        return True
+
+    def _write_atomic(self, content: str) -> None:
+        """Replace the config file with content via temp file, fsync and rename."""
+        directory = os.path.dirname(self.config_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        try:
+            mode = os.stat(self.config_path).st_mode & 0o777
+        except OSError:
+            mode = 0o644
+
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(self.config_path)}.", suffix=".tmp", dir=directory
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                tmp_file.write(content)
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, self.config_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        # Persist the rename itself
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
     
     def has_admin_override(self) -> bool:
-        """Check if admin override file exists."""
-        active = files.exists(self.admin_override_path)
-        if active:
-            PrintStyle().warning(f"🚨 Admin override ACTIVE")
+        """Check if admin override file exists.
+
+        The lock file's stat key is tracked per path so the override warning is
+        logged once when the override turns on (or the lock file is replaced),
+        not on every lookup.
+        """
+        key = stat_key(self.admin_override_path)
+        active = key is not None
+        known = self.admin_override_path in _OVERRIDE_STATE
+        previous = _OVERRIDE_STATE.get(self.admin_override_path)
+        if key != previous or not known:
+            _OVERRIDE_STATE[self.admin_override_path] = key
+            if active and (previous is None or previous[2] != key[2]):
+                PrintStyle().warning(f"🚨 Admin override ACTIVE")
+            elif not active and previous is not None:
+                PrintStyle().hint(f"Admin override cleared")
         return active
     
     def _get_default_config(self) -> dict:
@@ -93,10 +337,323 @@ class ConfigStore:
                 "workflow_profile_control": {"enabled": True},
                 "reasoning_profile_control": {"enabled": True},
                 "philosophy_profile_control": {"enabled": True},
-                "liminal_thinking_profile_control": {"enabled": True}
+                "liminal_thinking_profile_control": {"enabled": True},
+                "preset_control": {"enabled": True}
+            },
+            # Named bundles of profile and prompt-include settings (see apply_preset)
+            "presets": {},
+            # Token budgets for system prompt segments (see prompt_budget helper)
+            "prompt_budgets": {"enabled": False, "max_total_tokens": 0, "segments": {}},
+            # Message loop extras injection (see control_extras helper)
+            "system_control_extras": {"mode": "full"}
+        }
+
+
+def create_config_store(
+    config_path: str,
+    admin_override_path: str,
+    backend: str = "json",
+) -> ConfigStore:
+    """Create the ConfigStore for a backend name registered in CONFIG_BACKENDS.
+
+    Unknown or unloadable backends fall back to the plain JSON ConfigStore.
+    """
+    module_name, class_name = CONFIG_BACKENDS.get(backend, (None, None))
+    if module_name is None:
+        PrintStyle().error(f"❌ Unknown config backend '{backend}', using json")
+        return ConfigStore(config_path, admin_override_path)
+    try:
+        store_class = getattr(importlib.import_module(module_name), class_name)
+    except Exception as e:
+        PrintStyle().error(f"❌ Failed to load config backend '{backend}': {e}, using json")
+        return ConfigStore(config_path, admin_override_path)
+    return store_class(config_path, admin_override_path)
+
+
+# ============================================================================
+# SNAPSHOT LAYER
+# ============================================================================
+
+def compile_permission_table(config: dict, admin_override: bool = False) -> Dict[str, Tuple[bool, str]]:
+    """Compile the effective prompt-include/control permissions of a config.
+
+    Returns a flat name -> (enabled, source) table applying the precedence
+    prompt_includes > system_control_tools > active security profile
+    prompt_includes, with admin override forcing security-profile entries on.
+    Names appear once, in prompt_includes, system_control_tools, security
+    profile order. See ConfigSnapshot.get_entry_enabled_and_source for sources.
+    """
+    table: Dict[str, Tuple[bool, str]] = {}
+
+    for name, cfg in config.get("prompt_includes", {}).items():
+        table[name] = (cfg.get("enabled", False), "prompt_includes")
+
+    for name, cfg in config.get("system_control_tools", {}).items():
+        if name not in table:
+            table[name] = (cfg.get("enabled", False), "system_control_tools")
+
+    security_cfg = config.get("security", {})
+    profile_name = security_cfg.get("active_profile", "open") if isinstance(security_cfg, dict) else "open"
+    if profile_name:
+        profile_section = config.get("security_profiles", {}).get(profile_name, {})
+        for name, cfg in profile_section.get("prompt_includes", {}).items():
+            if name in table:
+                continue
+            if admin_override:
+                table[name] = (True, "admin_override")
+            else:
+                table[name] = (cfg.get("enabled", False), "security_profile")
+
+    return table
+
+
+def compile_presets(config: dict) -> Dict[str, dict]:
+    """Compile the presets section of a config into validated apply() change lists.
+
+    A preset bundles profile and prompt-include settings:
+
+        "presets": {
+            "research": {
+                "description": "Verbose workflow with the research philosophy",
+                "profiles": {"security": "open", "workflow_profile": "verbose"},
+                "prompt_includes": {"workflow_profile": true}
             }
         }
 
+    Returns name -> {"description", "changes", "errors"}. changes lists the
+    apply() items (profiles first, security first among them); errors lists
+    structural problems and references to unknown profile modules, security
+    profiles or prompt-includes/controls. Profile names of other modules are
+    validated against their profiles.json when the preset is applied.
+    """
+    section = config.get("presets", {})
+    if not isinstance(section, dict):
+        return {}
+
+    profile_modules = {"security"}
+    prompt_modules = config.get("prompt_modules", {})
+    if isinstance(prompt_modules, dict):
+        profile_modules.update(prompt_modules.keys())
+    security_profiles = config.get("security_profiles", {})
+    entries = set(config.get("prompt_includes", {})) | set(config.get("system_control_tools", {}))
+    if isinstance(security_profiles, dict):
+        for profile_section in security_profiles.values():
+            if isinstance(profile_section, dict):
+                entries.update(profile_section.get("prompt_includes", {}))
+
+    presets: Dict[str, dict] = {}
+    for name, preset in section.items():
+        changes: List[dict] = []
+        errors: List[str] = []
+        if not isinstance(preset, dict):
+            presets[name] = {"description": "", "changes": [], "errors": ["Preset must be an object"]}
+            continue
+
+        profiles = preset.get("profiles", {})
+        if not isinstance(profiles, dict):
+            errors.append("'profiles' must map profile modules to profile names")
+            profiles = {}
+        for profile_module_name in sorted(profiles, key=lambda module: module != "security"):
+            profile = profiles[profile_module_name]
+            if profile_module_name not in profile_modules:
+                errors.append(f"Unknown profile module '{profile_module_name}'")
+            elif not isinstance(profile, str) or not profile:
+                errors.append(f"Invalid profile for '{profile_module_name}': {profile!r}")
+            elif profile_module_name == "security" and isinstance(security_profiles, dict) and profile not in security_profiles:
+                errors.append(f"Security profile '{profile}' not found")
+            else:
+                changes.append({"profile_module": profile_module_name, "profile": profile})
+
+        prompt_includes = preset.get("prompt_includes", {})
+        if not isinstance(prompt_includes, dict):
+            errors.append("'prompt_includes' must map entries to true/false")
+            prompt_includes = {}
+        for entry, enabled in prompt_includes.items():
+            if entry not in entries:
+                errors.append(f"Unknown prompt-include/control '{entry}'")
+            elif not isinstance(enabled, bool):
+                errors.append(f"Invalid enabled value for '{entry}': {enabled!r}")
+            else:
+                changes.append({"prompt_include": entry, "enabled": enabled})
+
+        if not changes and not errors:
+            errors.append("Preset defines no profiles or prompt_includes")
+        presets[name] = {"description": str(preset.get("description", "")), "changes": changes, "errors": errors}
+
+    return presets
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable view of one configuration read plus the admin override state.
+
+    All query logic lives here so that composite queries (security state, system
+    summary, extras) resolve every entry from the same read and can never observe
+    a file that changed halfway through. The wrapped config dict may be shared
+    with the ConfigStore cache and must not be modified; use mutable_config()
+    to obtain a private copy for writing. Derived tables such as permissions are
+    compiled lazily, once per snapshot.
+    """
+
+    config: dict
+    admin_override: bool = False
+
+    def mutable_config(self) -> dict:
+        """Return a deep copy of the config that callers may modify and save."""
+        return copy.deepcopy(self.config)
+
+    @property
+    def version(self) -> int:
+        """Monotonic config_version written by ConfigStore (0 for never-saved configs)."""
+        version = self.config.get("config_version", 0)
+        return version if isinstance(version, int) else 0
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Hash of the config contents and override state, computed once per snapshot.
+
+        Unlike version, it also changes when the file is edited by hand.
+        """
+        data = json.dumps([self.config, self.admin_override], sort_keys=True, default=repr)
+        return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+    @cached_property
+    def presets(self) -> Dict[str, dict]:
+        """Compiled presets (see compile_presets), validated once per snapshot."""
+        presets = compile_presets(self.config)
+        for name, preset in presets.items():
+            errors = tuple(preset["errors"])
+            # Report each preset's problems once, not on every snapshot
+            if errors and _REPORTED_PRESET_ERRORS.get(name) != errors:
+                for error in errors:
+                    PrintStyle().warning(f"⚠️ Preset '{name}' is invalid: {error}")
+            _REPORTED_PRESET_ERRORS[name] = errors
+        return presets
+
+    @cached_property
+    def permissions(self) -> Dict[str, Tuple[bool, str]]:
+        """Effective name -> (enabled, source) table, compiled on first use."""
+        return compile_permission_table(self.config, self.admin_override)
+
+    def get_active(self, profile_module_name: str) -> str:
+        """Get active profile for a profile module (security or prompt_modules entry)."""
+        # Security profile uses dedicated config section
+        if profile_module_name == "security":
+            security_cfg = self.config.get("security", {})
+            if isinstance(security_cfg, dict):
+                return security_cfg.get("active_profile", "open")
+            return "open"
+
+        # Module-based profiles use prompt_modules[profile_module_name]
+        prompt_modules = self.config.get("prompt_modules", {})
+        if isinstance(prompt_modules, dict):
+            module_section = prompt_modules.get(profile_module_name, {})
+            if isinstance(module_section, dict):
+                return module_section.get("active_profile", "default")
+
+        return "default"
+
+    def get_security_profiles(self) -> List[str]:
+        """Get the security profile names defined in security_profiles."""
+        security_profiles = self.config.get("security_profiles", {})
+        if isinstance(security_profiles, dict):
+            return list(security_profiles.keys())
+        return []
+
+    def get_profile_modules(self) -> List[str]:
+        """Get all known profile modules (security + prompt_modules keys), sorted."""
+        types: set[str] = {"security"}
+        prompt_modules = self.config.get("prompt_modules", {})
+        if isinstance(prompt_modules, dict):
+            types.update(prompt_modules.keys())
+        return sorted(types)
+
+    def get_entry_enabled_and_source(self, name: str) -> tuple[bool, str]:
+        """Resolve prompt-include/control enabled flag and its source.
+
+        Source values:
+        - 'prompt_includes'       → top-level prompt_includes section
+        - 'system_control_tools'  → top-level system_control_tools section
+        - 'security_profile'      → active security profile prompt_includes
+        - 'admin_override'        → admin override forcing enabled
+        - 'not_found'             → entry not defined anywhere
+        """
+        return self.permissions.get(name, (False, "not_found"))
+
+    def get_prompt_include_config(self, include: str) -> dict:
+        """Get full prompt-include/control configuration.
+
+        Reads security profile 'prompt_includes', then global 'prompt_includes',
+        then falls back to system_control_tools for control-tool style entries.
+        """
+        config = self.config
+        profile_name = self.get_active("security")
+
+        security_section = config.get("security_profiles", {}).get(profile_name, {})
+        entry_config = security_section.get("prompt_includes", {}).get(include)
+        if entry_config is None:
+            entry_config = config.get("prompt_includes", {}).get(include)
+        if entry_config is None:
+            entry_config = config.get("system_control_tools", {}).get(include, {})
+
+        return entry_config or {}
+
+    def get_available_prompt_includes_and_controls(self) -> list[str]:
+        """Get sorted list of available prompt-includes and system control tools."""
+        entries: set[str] = set()
+        entries.update(self.config.get("prompt_includes", {}).keys())
+        entries.update(self.config.get("system_control_tools", {}).keys())
+        return sorted(entries)
+
+    def get_enabled_prompt_includes_and_controls(self) -> list[str]:
+        """Get list of effectively enabled prompt-includes and system control tools.
+
+        Each name is listed once, with its effective (precedence-resolved) state.
+        """
+        return [name for name, (enabled, _) in self.permissions.items() if enabled]
+
+    def is_control_enabled(self, control_name: str) -> bool:
+        """Check if a control is enabled in the system_control_tools section."""
+        system_control_tools = self.config.get("system_control_tools", {})
+        control_config = system_control_tools.get(control_name, {})
+        return control_config.get("enabled", False)
+
+    def get_prompt_budgets(self) -> dict:
+        """Get the prompt_budgets section with defaults applied."""
+        section = self.config.get("prompt_budgets", {})
+        if not isinstance(section, dict):
+            section = {}
+        segments = section.get("segments", {})
+        return {
+            "enabled": bool(section.get("enabled", False)),
+            "max_total_tokens": int(section.get("max_total_tokens", 0) or 0),
+            "segments": segments if isinstance(segments, dict) else {},
+        }
+
+    def get_segment_budget(self, source: str) -> Optional[dict]:
+        """Get the budget of one system prompt segment, or None if budgets are off or it has none.
+
+        Budget keys: max_tokens (0 = no limit), on_exceed ("truncate" or "drop")
+        and priority (segments with lower priority are dropped first when the
+        total budget is exceeded; None = never dropped).
+        """
+        budgets = self.get_prompt_budgets()
+        budget = budgets["segments"].get(source)
+        if not budgets["enabled"] or not isinstance(budget, dict):
+            return None
+        priority = budget.get("priority")
+        return {
+            "max_tokens": int(budget.get("max_tokens", 0) or 0),
+            "on_exceed": "drop" if budget.get("on_exceed") == "drop" else "truncate",
+            "priority": priority if isinstance(priority, (int, float)) else None,
+        }
+
+    def get_extras_mode(self) -> str:
+        """Get the message loop extras mode: "full" (default) or "delta"."""
+        section = self.config.get("system_control_extras", {})
+        mode = section.get("mode", "full") if isinstance(section, dict) else "full"
+        return mode if mode in EXTRAS_MODES else "full"
+
 
 # ============================================================================
 # PROFILE MANAGEMENT LAYER
@@ -108,84 +665,89 @@ class ProfileManager:
     This manager intentionally does not know about concrete profile variants.
     For module-based profiles, the profile_module_name string is treated as the
     prompt_modules key. Security is handled as a special case using the
-    "security" and "security_profiles" keys.
+    "security" and "security_profiles" keys. Available profiles and features
+    of module-based profiles come from the ProfileModuleIndex of profiles.json
+    files.
+
+    Read methods accept an optional ConfigSnapshot; when omitted, a fresh one is
+    taken from the store.
     """
 
-    def __init__(self, config_store: ConfigStore):
+    def __init__(self, config_store: ConfigStore, profile_index: Optional[ProfileModuleIndex] = None):
         self.store = config_store
+        self.profile_index = profile_index or get_profile_index()
 
     def _is_security_module(self, profile_module_name: str) -> bool:
         """Return True if the given profile_module_name refers to the security profile."""
         return profile_module_name == "security"
 
-    def get_active(self, profile_module_name: str) -> str:
+    def get_active(self, profile_module_name: str, snapshot: Optional[ConfigSnapshot] = None) -> str:
         """Get active profile for specified profile module.
 
         For module-based profiles this reads prompt_modules[profile_module_name].active_profile.
         For security it reads security.active_profile.
         """
-        config = self.store.load()
-
-        # Security profile uses dedicated config section
-        if self._is_security_module(profile_module_name):
-            security_cfg = config.get("security", {})
-            if isinstance(security_cfg, dict):
-                return security_cfg.get("active_profile", "open")
-            return "open"
-
-        # Module-based profiles use prompt_modules[profile_module_name]
-        prompt_modules = config.get("prompt_modules", {})
-        if isinstance(prompt_modules, dict):
-            module_section = prompt_modules.get(profile_module_name, {})
-            if isinstance(module_section, dict):
-                return module_section.get("active_profile", "default")
+        snapshot = snapshot or self.store.snapshot()
+        return snapshot.get_active(profile_module_name)
 
-        return "default"
-
-    def get_available(self, profile_module_name: str) -> List[str]:
+    def get_available(self, profile_module_name: str, snapshot: Optional[ConfigSnapshot] = None) -> List[str]:
         """Get list of available profiles for the given profile module.
 
         For security, this is derived from the security_profiles section.
-        For module-based profiles, availability is determined by profiles.json
-        files in the profile modules and is not tracked in system_control.json,
-        so this returns an empty list.
+        For module-based profiles, availability is determined by the module's
+        profiles.json (via the profile module index); modules without one
+        return an empty list.
         """
         # Security profiles are defined in the config file
         if self._is_security_module(profile_module_name):
-            config = self.store.load()
-            security_profiles = config.get("security_profiles", {})
-            if isinstance(security_profiles, dict):
-                return list(security_profiles.keys())
-            return []
+            snapshot = snapshot or self.store.snapshot()
+            return snapshot.get_security_profiles()
 
-        # Module-based profile availability is owned by profiles.json loaders
-        return []
+        # Module-based profile availability is owned by profiles.json
+        return self.profile_index.get_profiles(profile_module_name) or []
 
     def set_active(self, profile_module_name: str, profile: str) -> dict:
         """Set active profile for specified profile module.
 
         For security, validates against the configured security_profiles. For
-        module-based profiles, this simply records the requested profile name
-        under prompt_modules[profile_module_name].active_profile and lets the profile
-        loaders validate it against profiles.json.
+        module-based profiles, validates against the module's profiles.json (when
+        the module is indexed) and records the profile name under
+        prompt_modules[profile_module_name].active_profile. The change is applied
+        as one locked read-modify-write, so concurrent writers cannot lose it.
         """
-        config = self.store.load()
+        return self.store.update(
+            lambda snapshot, config: self.apply_active(snapshot, config, profile_module_name, profile)
+        )
 
+    def apply_active(self, snapshot: ConfigSnapshot, config: dict, profile_module_name: str, profile: str) -> Tuple[bool, dict]:
+        """Validate and apply an active-profile change to a mutable config.
+
+        snapshot is the state the change is validated against; config is the
+        mutable copy being written. Returns (changed, result) for ConfigStore.update.
+        """
         # Security profile: validate against known profiles if available
         if self._is_security_module(profile_module_name):
-            available = self.get_available(profile_module_name)
+            available = self.get_available(profile_module_name, snapshot)
             if available and profile not in available:
-                return {
+                return False, {
                     "success": False,
                     "error": f"Security profile '{profile}' not found",
                     "available_profiles": available,
                 }
+        else:
+            valid, available = self.profile_index.validate(profile_module_name, profile)
+            if not valid:
+                return False, {
+                    "success": False,
+                    "error": f"Profile '{profile}' not found in {profile_module_name}",
+                    "available_profiles": available,
+                }
 
         # Get old profile
-        old_profile = self.get_active(profile_module_name)
+        old_profile = snapshot.get_active(profile_module_name)
         if old_profile == profile:
             label = "security" if self._is_security_module(profile_module_name) else "profile"
-            return {
+            return False, {
                 "success": True,
                 "message": f"Already on {label} '{profile}'",
                 "profile": profile,
@@ -209,34 +771,106 @@ class ProfileManager:
             prompt_modules[profile_module_name] = module_section
             config["prompt_modules"] = prompt_modules
 
-        # Save to disk
-        if not self.store.save(config):
-            return {"success": False, "error": "Failed to write configuration"}
-
-        return {
+        return True, {
             "success": True,
             "previous_profile": old_profile,
             "new_profile": profile,
             "message": f"Profile changed from '{old_profile}' to '{profile}'",
         }
 
-    def get_state(self, profile_module_name: str) -> dict:
+    def get_state(self, profile_module_name: str, snapshot: Optional[ConfigSnapshot] = None) -> dict:
         """Get complete state for specified profile module.
 
-        Features are loaded from profiles.json files by the profile loaders, so
-        this method only returns the active profile name and available profile
-        ids (when known).
+        Returns the active profile name, the available profile ids and the
+        active profile's feature definitions from profiles.json (empty for
+        security and for modules without a profiles.json).
         """
-        profile_name = self.get_active(profile_module_name)
-        available = self.get_available(profile_module_name)
+        snapshot = snapshot or self.store.snapshot()
+        profile_name = self.get_active(profile_module_name, snapshot)
+        available = self.get_available(profile_module_name, snapshot)
+        features = {}
+        if not self._is_security_module(profile_module_name):
+            features = self.profile_index.get_features(profile_module_name, profile_name)
 
         return {
             "active_profile": profile_name,
             "available_profiles": available,
-            "features": {},  # Features loaded from profiles.json by profile loaders
+            "features": features,
         }
 
 
+# ============================================================================
+# CHANGE NOTIFICATIONS
+# ============================================================================
+
+def diff_sections(old: Optional[ConfigSnapshot], new: ConfigSnapshot) -> Set[str]:
+    """Return the names of config sections that differ between two snapshots.
+
+    Top-level keys are compared by value; "security_profiles" is reported as
+    "security" and "config_version" is ignored. A change of the admin override
+    state is reported as both "admin_override" and "security".
+    """
+    if old is None:
+        return set(new.config) | {"admin_override"}
+
+    changed: Set[str] = set()
+    for key in set(old.config) | set(new.config):
+        if key == "config_version":
+            continue
+        if old.config.get(key) != new.config.get(key):
+            changed.add("security" if key == "security_profiles" else key)
+    if old.admin_override != new.admin_override:
+        changed.update(("admin_override", "security"))
+    return changed
+
+
+class ConfigChangeNotifier:
+    """Calls subscribers with the changed sections whenever the config changes.
+
+    Backed by a FileWatcher on the store's watch_paths(). Each file event takes
+    a fresh snapshot, diffs it against the previous one and, if any section
+    changed, calls callback(changed_sections, snapshot) on the watcher thread.
+    """
+    
+    def __init__(self, config_store: ConfigStore):
+        self.config_store = config_store
+        self._subscribers: List[Callable[[Set[str], ConfigSnapshot], None]] = []
+        self._last: Optional[ConfigSnapshot] = None
+        self._watcher = FileWatcher(config_store.watch_paths(), poll_interval=WATCH_POLL_INTERVAL)
+        self._unwatch: Optional[Callable[[], None]] = None
+        self._lock = threading.Lock()
+    
+    def subscribe(self, callback: Callable[[Set[str], ConfigSnapshot], None]) -> Callable[[], None]:
+        """Register callback(changed_sections, snapshot); returns an unsubscribe function."""
+        with self._lock:
+            self._subscribers.append(callback)
+            # Under the lock so concurrent first subscribers start the watcher only once
+            if self._unwatch is None:
+                self._last = self.config_store.snapshot()
+                self._unwatch = self._watcher.subscribe(self._on_files_changed)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+    
+    def _on_files_changed(self, paths: Set[str]) -> None:
+        snapshot = self.config_store.snapshot()
+        with self._lock:
+            sections = diff_sections(self._last, snapshot)
+            self._last = snapshot
+            subscribers = list(self._subscribers)
+        if not sections:
+            return
+        for callback in subscribers:
+            try:
+                callback(sections, snapshot)
+            except Exception as e:
+                PrintStyle().error(f"❌ SystemControl subscriber error: {e}")
+
+
 # ============================================================================
 # MAIN FACADE CLASS
 # ============================================================================
@@ -246,12 +880,22 @@ class SystemControl:
     
     Provides clean, explicit methods for profile and prompt-include management.
     All profile control tools use profile module names (e.g., "workflow_profile").
+
+    Query methods accept an optional ConfigSnapshot (see snapshot()). Callers that
+    ask several questions in a row should take one snapshot and pass it to each
+    call so the answers are consistent and the config is read only once.
     """
     
-    def __init__(self):
-        """Initialize SystemControl with modular components."""
+    def __init__(self, backend: Optional[str] = None):
+        """Initialize SystemControl with modular components.
+
+        backend selects the config storage (see CONFIG_BACKENDS). When None, it is
+        taken from the SYSTEM_CONTROL_BACKEND environment variable ("json" by default).
+        """
         control_file, admin_override_file = self._resolve_control_paths()
-        self.config_store = ConfigStore(control_file, admin_override_file)
+        if backend is None:
+            backend = self._resolve_backend()
+        self.config_store = create_config_store(control_file, admin_override_file, backend)
         # Initialize managers
         self.profile_manager = ProfileManager(self.config_store)
     
@@ -262,47 +906,78 @@ class SystemControl:
         admin_override = os.environ.get("SYSTEM_CONTROL_OVERRIDE", ADMIN_OVERRIDE_FILE)
         return control_file, admin_override
     
+    def _resolve_backend(self) -> str:
+        """Resolve the config storage backend name from the environment."""
+        return os.environ.get("SYSTEM_CONTROL_BACKEND", "json").strip().lower() or "json"
+    
+    def snapshot(self) -> ConfigSnapshot:
+        """Take an immutable snapshot of the current configuration and override state."""
+        return self.config_store.snapshot()
+
+    def subscribe(self, callback: Callable[[Set[str], ConfigSnapshot], None]) -> Callable[[], None]:
+        """Call callback(changed_sections, snapshot) whenever the configuration changes.
+
+        Sections are top-level config keys such as "security", "prompt_modules",
+        "prompt_includes" and "system_control_tools", plus "admin_override" when
+        the override lock file appears or disappears. Changes are detected with
+        inotify where available and by polling otherwise; callbacks run on a
+        background thread. Returns a function that removes the subscription.
+        """
+        key = (self.config_store.config_path, self.config_store.admin_override_path)
+        with _NOTIFIERS_LOCK:
+            notifier = _NOTIFIERS.get(key)
+            if notifier is None:
+                notifier = ConfigChangeNotifier(self.config_store)
+                _NOTIFIERS[key] = notifier
+        return notifier.subscribe(callback)
+
     # ========================================================================
     # CORE GENERIC METHODS
     # ========================================================================
     
-    def get_active_profile(self, profile_module_name: str) -> str:
+    def get_active_profile(self, profile_module_name: str, snapshot: Optional[ConfigSnapshot] = None) -> str:
         """Get active profile for specified profile module."""
-        profile = self.profile_manager.get_active(profile_module_name)
+        profile = self.profile_manager.get_active(profile_module_name, snapshot)
+        record_config("active", profile_module_name, profile)
         return profile
     
     def set_active_profile(self, profile_module_name: str, profile: str) -> dict:
         """Set active profile for specified profile module."""
         return self.profile_manager.set_active(profile_module_name, profile)
     
-    def get_state(self, profile_module_name: str) -> dict:
+    def get_state(self, profile_module_name: str, snapshot: Optional[ConfigSnapshot] = None) -> dict:
         """Get complete state for specified profile module."""
-        return self.profile_manager.get_state(profile_module_name)
+        return self.profile_manager.get_state(profile_module_name, snapshot)
     
-    def get_available_profiles(self, profile_module_name: str) -> List[str]:
+    def get_available_profiles(self, profile_module_name: str, snapshot: Optional[ConfigSnapshot] = None) -> List[str]:
         """Get available profiles for specified profile module."""
-        profiles = self.profile_manager.get_available(profile_module_name)
+        profiles = self.profile_manager.get_available(profile_module_name, snapshot)
         return profiles
     
+    def get_active_profiles(
+        self, profile_module_names: Iterable[str], snapshot: Optional[ConfigSnapshot] = None
+    ) -> Dict[str, str]:
+        """Get the active profile of each profile module, all resolved from one snapshot."""
+        snapshot = snapshot or self.snapshot()
+        return {name: self.get_active_profile(name, snapshot) for name in profile_module_names}
+
+    def get_states(
+        self, profile_module_names: Iterable[str], snapshot: Optional[ConfigSnapshot] = None
+    ) -> Dict[str, dict]:
+        """Get the complete state of each profile module, all resolved from one snapshot."""
+        snapshot = snapshot or self.snapshot()
+        return {name: self.get_state(name, snapshot) for name in profile_module_names}
+    
     # Note: Feature-level configuration is owned by profile loaders reading
     # profiles.json in each module; SystemControl does not expose feature
     # enable/disable methods.
 
-    def get_available_profile_modules(self) -> List[str]:
+    def get_available_profile_modules(self, snapshot: Optional[ConfigSnapshot] = None) -> List[str]:
         """Get list of all known profile modules (security + prompt_modules keys)."""
-        types: set[str] = set()
-        # Always include security
-        types.add("security")
-
-        # Add any module-based profiles present in prompt_modules
-        config = self.config_store.load()
-        prompt_modules = config.get("prompt_modules", {})
-        if isinstance(prompt_modules, dict):
-            types.update(prompt_modules.keys())
+        snapshot = snapshot or self.snapshot()
+        return snapshot.get_profile_modules()
 
-        return sorted(types)
-    
-    def get_profile_choices(self, profile_module_name: str) -> dict:
+    def get_profile_choices(self, profile_module_name: str, snapshot: Optional[ConfigSnapshot] = None) -> dict:
         """Get available profiles for a profile module.
 
         The human-friendly display name for a profile module is supplied by the
@@ -310,7 +985,7 @@ class SystemControl:
         responsibility here is only to surface the available profile names, when
         known.
         """
-        available = self.get_available_profiles(profile_module_name)
+        available = self.get_available_profiles(profile_module_name, snapshot)
         return {
             "success": True,
             "profile_module_name": profile_module_name,
@@ -324,6 +999,7 @@ class SystemControl:
         profile_module_control_key: str,
         profile_module_display_name: str,
         action: str = "",
+        snapshot: Optional[ConfigSnapshot] = None,
         **kwargs,
     ) -> dict:
         """Run a generic profile control action for a given profile module.
@@ -334,12 +1010,16 @@ class SystemControl:
         - get_profile: active profile and available profiles
         - set_profile: change active profile with robust change/no-op handling
 
+        All reads before a write are answered from one snapshot (the given one,
+        or a fresh one); the post-write state is read from a new snapshot.
+
         Returns a plain dict with 'message' and 'break_loop' keys, suitable for
         wrapping by Tool/Response in the agents layer.
         """
+        snapshot = snapshot or self.snapshot()
 
         # Check if tool/control is enabled
-        if not self.is_control_enabled(profile_module_control_key):
+        if not self.is_control_enabled(profile_module_control_key, snapshot):
             return {
                 "message": (
                     f"{profile_module_display_name} control tool is disabled by current security profile. "
@@ -350,7 +1030,7 @@ class SystemControl:
 
         # Route to action handlers
         if action == "get_state":
-            state = self.get_state(profile_module_name)
+            state = self.get_state(profile_module_name, snapshot)
 
             lines = [
                 f"=== {profile_module_display_name} Status (SystemControl) ===",
@@ -371,8 +1051,8 @@ class SystemControl:
             return {"message": "\n".join(lines), "break_loop": False}
 
         if action == "get_profile":
-            profile_name = self.get_active_profile(profile_module_name)
-            choices = self.get_profile_choices(profile_module_name)
+            profile_name = self.get_active_profile(profile_module_name, snapshot)
+            choices = self.get_profile_choices(profile_module_name, snapshot)
             available = choices.get("available_profiles", [])
 
             lines = [
@@ -386,7 +1066,7 @@ class SystemControl:
             profile = kwargs.get("profile", "")
 
             if not profile:
-                choices = self.get_profile_choices(profile_module_name)
+                choices = self.get_profile_choices(profile_module_name, snapshot)
                 available = choices.get("available_profiles", [])
                 return {
                     "message": (
@@ -398,60 +1078,8 @@ class SystemControl:
 
             # Attempt to change profile
             result = self.set_active_profile(profile_module_name, profile)
-
-            if not result.get("success", False):
-                error = result.get("error", "Unknown error")
-                available = result.get("available_profiles", [])
-                msg = f"Failed to change {profile_module_display_name.lower()}: {error}"
-                if available:
-                    msg += f"\nAvailable profiles: {', '.join(available)}"
-                return {"message": msg, "break_loop": False}
-
-            # Success - format detailed response, handling both changed and no-op cases
-            previous_profile = result.get("previous_profile")
-            new_profile = result.get("new_profile")
-
-            if previous_profile is not None and new_profile is not None:
-                # Profile actually changed
-                lines = [
-                    f"✓ {profile_module_display_name} changed: {previous_profile} → {new_profile}",
-                    "",
-                    "Profile configuration updated. Changes take effect immediately.",
-                    "",
-                    (
-                        f"Note: The new {profile_module_display_name.lower()} prompt will be "
-                        "loaded on the next message loop."
-                    ),
-                ]
-            else:
-                # No-op success (e.g. already on this profile)
-                active = result.get("profile") or self.get_active_profile(profile_module_name)
-                message = result.get(
-                    "message",
-                    f"Already on {profile_module_display_name.lower()} '{active}'",
-                )
-                lines = [
-                    message,
-                    "",
-                    f"Active {profile_module_display_name}: {active}",
-                    "",
-                    (
-                        f"Note: The {profile_module_display_name.lower()} prompt will be "
-                        "loaded on the next message loop."
-                    ),
-                ]
-
-            # Get new state to show impact
-            state = self.get_state(profile_module_name)
-            if state.get("features"):
-                lines.append("")
-                lines.append("Profile prompt includes:")
-                for feature, config in state["features"].items():
-                    enabled = config.get("enabled", False)
-                    status = "ENABLED" if enabled else "DISABLED"
-                    lines.append(f"  - {feature}: {status}")
-
-            return {"message": "\n".join(lines), "break_loop": False}
+            message = self.format_profile_change(profile_module_name, profile_module_display_name, result)
+            return {"message": message, "break_loop": False}
 
         # Unknown action
         return {
@@ -461,31 +1089,180 @@ class SystemControl:
             "break_loop": False,
         }
     
-    def get_all_profiles_state(self) -> Dict[str, dict]:
+    def format_profile_change(
+        self,
+        profile_module_name: str,
+        profile_module_display_name: str,
+        result: dict,
+        snapshot: Optional[ConfigSnapshot] = None,
+    ) -> str:
+        """Format a set_active_profile (or apply) item result as a tool message.
+
+        snapshot is the post-write state used to show the profile's prompt
+        includes; a fresh one is taken when omitted.
+        """
+        if not result.get("success", False):
+            error = result.get("error", "Unknown error")
+            available = result.get("available_profiles", [])
+            msg = f"Failed to change {profile_module_display_name.lower()}: {error}"
+            if available:
+                msg += f"\nAvailable profiles: {', '.join(available)}"
+            return msg
+
+        # Success - format detailed response, handling both changed and no-op cases
+        previous_profile = result.get("previous_profile")
+        new_profile = result.get("new_profile")
+        after = snapshot or self.snapshot()
+
+        if previous_profile is not None and new_profile is not None:
+            # Profile actually changed
+            lines = [
+                f"✓ {profile_module_display_name} changed: {previous_profile} → {new_profile}",
+                "",
+                "Profile configuration updated. Changes take effect immediately.",
+                "",
+                (
+                    f"Note: The new {profile_module_display_name.lower()} prompt will be "
+                    "loaded on the next message loop."
+                ),
+            ]
+        else:
+            # No-op success (e.g. already on this profile)
+            active = result.get("profile") or self.get_active_profile(profile_module_name, after)
+            message = result.get(
+                "message",
+                f"Already on {profile_module_display_name.lower()} '{active}'",
+            )
+            lines = [
+                message,
+                "",
+                f"Active {profile_module_display_name}: {active}",
+                "",
+                (
+                    f"Note: The {profile_module_display_name.lower()} prompt will be "
+                    "loaded on the next message loop."
+                ),
+            ]
+
+        # Get new state to show impact
+        state = self.get_state(profile_module_name, after)
+        if state.get("features"):
+            lines.append("")
+            lines.append("Profile prompt includes:")
+            for feature, config in state["features"].items():
+                enabled = config.get("enabled", False)
+                status = "ENABLED" if enabled else "DISABLED"
+                lines.append(f"  - {feature}: {status}")
+
+        return "\n".join(lines)
+    
+    def apply(self, changes: List[dict], fleet: bool = False) -> dict:
+        """Apply several profile and prompt-include changes in one atomic write.
+
+        Each change is a dict in one of two forms:
+            {"profile_module": "workflow_profile", "profile": "default"}
+            {"prompt_include": "godmode", "enabled": False}
+
+        All changes are validated against the same snapshot under the writer
+        lock and written together; if any change fails, nothing is written.
+        Like set_active_profile and set_prompt_include_option, no tool gating is
+        applied here.
+
+        Returns {"success", "changed", "message", "results"}, where results[i]
+        is the dict set_active_profile / set_prompt_include_option would return
+        for changes[i] (see format_profile_change for rendering profile items).
+
+        With fleet=True the changes are made to the fleet-wide defaults of a
+        store that supports them (the sqlite backend) and replace per-agent values.
+        """
+        mutate = lambda snapshot, config: self._apply_changes(snapshot, config, changes)
+        if not fleet:
+            return self.config_store.update(mutate)
+        if not hasattr(self.config_store, "update_fleet"):
+            return {"success": False, "error": "Config backend does not support fleet-wide changes"}
+        return self.config_store.update_fleet(mutate)
+
+    def _apply_changes(self, snapshot: ConfigSnapshot, config: dict, changes: List[dict]) -> Tuple[bool, dict]:
+        """Validate and apply a list of changes to a mutable config; returns (changed, result)."""
+        results = []
+        changed_count = 0
+        seen = set()
+        for change in changes:
+            changed, result = self._apply_change(snapshot, config, change, seen)
+            if changed:
+                changed_count += 1
+            results.append(result)
+
+        failed = sum(1 for result in results if not result.get("success", False))
+        if failed:
+            message = f"No changes applied: {failed} of {len(results)} changes failed"
+        elif changed_count:
+            message = f"Applied {changed_count} change(s) in one write"
+        else:
+            message = "No changes needed"
+
+        return (not failed and changed_count > 0), {
+            "success": not failed,
+            "changed": changed_count if not failed else 0,
+            "message": message,
+            "results": results,
+        }
+
+    def _apply_change(self, snapshot: ConfigSnapshot, config: dict, change: dict, seen: set) -> Tuple[bool, dict]:
+        """Apply one apply() item; seen holds targets already changed in this batch."""
+        if not isinstance(change, dict):
+            return False, {"success": False, "error": f"Invalid change: {change!r}"}
+
+        if "profile_module" in change:
+            profile_module_name = change["profile_module"]
+            profile = change.get("profile", "")
+            target = ("profile_module", profile_module_name)
+            if not profile:
+                changed, result = False, {"success": False, "error": "Missing 'profile' parameter"}
+            elif target in seen:
+                changed, result = False, {"success": False, "error": f"Duplicate change for '{profile_module_name}'"}
+            else:
+                changed, result = self.profile_manager.apply_active(snapshot, config, profile_module_name, profile)
+        elif "prompt_include" in change:
+            name = change["prompt_include"]
+            enabled = change.get("enabled")
+            target = ("prompt_include", name)
+            if not isinstance(enabled, bool):
+                changed, result = False, {"success": False, "error": f"Missing or invalid 'enabled' for '{name}'"}
+            elif target in seen:
+                changed, result = False, {"success": False, "error": f"Duplicate change for '{name}'"}
+            else:
+                changed, result = self._apply_prompt_include_option(config, name, enabled)
+        else:
+            return False, {"success": False, "error": f"Unknown change: {change!r}"}
+
+        seen.add(target)
+        item = {target[0]: target[1]}
+        item.update(result)
+        return changed, item
+    
+    def get_all_profiles_state(self, snapshot: Optional[ConfigSnapshot] = None) -> Dict[str, dict]:
         """Get state for all known profile modules.
 
         Security state is provided by get_security_state. Other profile modules
         are inferred from the prompt_modules section using their module names
         as type identifiers.
         """
+        snapshot = snapshot or self.snapshot()
         states: Dict[str, dict] = {}
 
         # Always include security profile state
-        states["security"] = self.get_security_state()
+        states["security"] = self.get_security_state(snapshot)
 
         # Include any module-based profiles present in prompt_modules
-        config = self.config_store.load()
-        prompt_modules = config.get("prompt_modules", {})
+        # (skipping "security" avoids clobbering the dedicated security entry)
+        prompt_modules = snapshot.config.get("prompt_modules", {})
         if isinstance(prompt_modules, dict):
-            for profile_module_name in prompt_modules.keys():
-                if profile_module_name == "security":
-                    # Avoid clobbering the dedicated security entry
-                    continue
-                states[profile_module_name] = self.get_state(profile_module_name)
+            states.update(self.get_states([name for name in prompt_modules if name != "security"], snapshot))
 
         return states
 
-    def get_all_profiles_extras(self) -> dict:
+    def get_all_profiles_extras(self, snapshot: Optional[ConfigSnapshot] = None) -> dict:
         """Get concise extras for all profile modules for message loop extensions.
 
         Returns a mapping of profile module names to their active profile and an
@@ -502,35 +1279,108 @@ class SystemControl:
                 }
             }
         """
+        snapshot = snapshot or self.snapshot()
         profiles: Dict[str, dict] = {}
 
-        for profile_module_name in self.get_available_profile_modules():
-            if profile_module_name == "security":
-                continue
+        profile_module_names = [
+            name for name in self.get_available_profile_modules(snapshot) if name != "security"
+        ]
+        # Only the active profile names are needed, not the profiles' feature definitions
+        active_profiles = self.get_active_profiles(profile_module_names, snapshot)
 
-            state = self.get_state(profile_module_name)
-            enabled, _ = self._get_entry_enabled_and_source(profile_module_name)
+        for profile_module_name in profile_module_names:
+            enabled, _ = snapshot.get_entry_enabled_and_source(profile_module_name)
 
             profiles[profile_module_name] = {
-                "active_profile": state.get("active_profile", "unknown"),
+                "active_profile": active_profiles[profile_module_name],
                 "enabled": enabled,
             }
 
         return {"profiles": profiles}
     
-    def get_system_summary(self) -> dict:
+    def get_system_summary(self, snapshot: Optional[ConfigSnapshot] = None) -> dict:
         """Get a high-level summary of SystemControl state.
 
         Returns profiles, enabled/available prompt-includes/controls, and admin
-        override flag.
+        override flag, all resolved from a single snapshot.
         """
+        snapshot = snapshot or self.snapshot()
         return {
-            "profiles": self.get_all_profiles_state(),
-            "enabled_prompt_includes_and_controls": self.get_enabled_prompt_includes_and_controls(),
-            "available_prompt_includes_and_controls": self.get_available_prompt_includes_and_controls(),
-            "admin_override": self.is_admin_override_active(),
+            "profiles": self.get_all_profiles_state(snapshot),
+            "enabled_prompt_includes_and_controls": self.get_enabled_prompt_includes_and_controls(snapshot),
+            "available_prompt_includes_and_controls": self.get_available_prompt_includes_and_controls(snapshot),
+            "admin_override": snapshot.admin_override,
         }
 
+    # ========================================================================
+    # PROMPT BUDGET METHODS
+    # ========================================================================
+
+    def get_prompt_budgets(self, snapshot: Optional[ConfigSnapshot] = None) -> dict:
+        """Get the prompt_budgets section: enabled flag, max_total_tokens and per-segment budgets."""
+        snapshot = snapshot or self.snapshot()
+        return snapshot.get_prompt_budgets()
+
+    def get_segment_budget(self, source: str, snapshot: Optional[ConfigSnapshot] = None) -> Optional[dict]:
+        """Get the effective budget of a system prompt segment (None when not budgeted)."""
+        snapshot = snapshot or self.snapshot()
+        budget = snapshot.get_segment_budget(source)
+        record_config("budget", source, budget)
+        return budget
+
+    # ========================================================================
+    # PRESET METHODS
+    # ========================================================================
+
+    def get_presets(self, snapshot: Optional[ConfigSnapshot] = None) -> Dict[str, dict]:
+        """Get the compiled presets: name -> {"description", "changes", "errors"}."""
+        snapshot = snapshot or self.snapshot()
+        return snapshot.presets
+
+    def apply_preset(self, name: str, fleet: bool = False) -> dict:
+        """Apply every setting of a preset in one atomic, validated write.
+
+        The preset is taken from the snapshot the write is validated against, so
+        it cannot change between lookup and write. An unknown or invalid preset,
+        or any failing change, leaves the configuration untouched. Returns the
+        apply() result plus "preset"; with fleet=True the preset is applied to
+        the fleet-wide defaults (see apply()).
+        """
+
+        def mutate(snapshot: ConfigSnapshot, config: dict) -> Tuple[bool, dict]:
+            preset = snapshot.presets.get(name)
+            if preset is None:
+                return False, {
+                    "success": False,
+                    "preset": name,
+                    "error": f"Preset '{name}' not found",
+                    "available_presets": sorted(snapshot.presets),
+                }
+            if preset["errors"]:
+                return False, {
+                    "success": False,
+                    "preset": name,
+                    "error": f"Preset '{name}' is invalid: " + "; ".join(preset["errors"]),
+                }
+            changed, result = self._apply_changes(snapshot, config, preset["changes"])
+            result["preset"] = name
+            return changed, result
+
+        if not fleet:
+            return self.config_store.update(mutate)
+        if not hasattr(self.config_store, "update_fleet"):
+            return {"success": False, "preset": name, "error": "Config backend does not support fleet-wide changes"}
+        return self.config_store.update_fleet(mutate)
+
+    # ========================================================================
+    # MESSAGE LOOP EXTRAS METHODS
+    # ========================================================================
+
+    def get_extras_mode(self, snapshot: Optional[ConfigSnapshot] = None) -> str:
+        """Get how the message loop injects the system control extras ("full" or "delta")."""
+        snapshot = snapshot or self.snapshot()
+        return snapshot.get_extras_mode()
+
     # ========================================================================
     # SECURITY-SPECIFIC METHODS
     # ========================================================================
@@ -539,114 +1389,58 @@ class SystemControl:
         """Check if admin override file exists."""
         return self.config_store.has_admin_override()
     
-    def _get_entry_enabled_and_source(self, name: str) -> tuple[bool, str]:
+    def _get_entry_enabled_and_source(self, name: str, snapshot: Optional[ConfigSnapshot] = None) -> tuple[bool, str]:
         """Internal helper: resolve prompt-include/control enabled flag and its source.
 
-        Source values:
-        - 'prompt_includes'       → top-level prompt_includes section
-        - 'system_control_tools'  → top-level system_control_tools section
-        - 'security_profile'      → active security profile prompt_includes
-        - 'admin_override'        → admin override forcing enabled
-        - 'not_found'             → entry not defined anywhere
+        See ConfigSnapshot.get_entry_enabled_and_source for the source values.
         """
-        config = self.config_store.load()
-        admin_override = self.config_store.has_admin_override()
-
-        enabled, source = False, "not_found"
-
-        # Global prompt-includes, then system_control_tools, then security-profile prompt-includes
-        prompt_includes = config.get("prompt_includes", {})
-
-        if name in prompt_includes:
-            enabled = prompt_includes[name].get("enabled", False)
-            source = "prompt_includes"
-        elif name in config.get("system_control_tools", {}):
-            enabled, source = config["system_control_tools"][name].get("enabled", False), "system_control_tools"
-        else:
-            profile_name = self.get_active_profile("security")
-            if profile_name:
-                profile_section = config.get("security_profiles", {}).get(profile_name, {})
-                profile_includes = profile_section.get("prompt_includes", {})
-                if name in profile_includes:
-                    enabled = profile_includes[name].get("enabled", False)
-                    source = "security_profile"
-
-        if admin_override and source == "security_profile":
-            enabled, source = True, "admin_override"
+        snapshot = snapshot or self.snapshot()
+        result = snapshot.get_entry_enabled_and_source(name)
+        record_config("permission", name, result)
+        return result
 
-        return enabled, source
-
-    def is_prompt_include_enabled(self, include: str) -> bool:
+    def is_prompt_include_enabled(self, include: str, snapshot: Optional[ConfigSnapshot] = None) -> bool:
         """Check if a prompt-include/control entry is enabled."""
-        enabled, _ = self._get_entry_enabled_and_source(include)
+        enabled, _ = self._get_entry_enabled_and_source(include, snapshot)
         return enabled
 
-    def get_prompt_include_source(self, include: str) -> str:
+    def get_prompt_include_source(self, include: str, snapshot: Optional[ConfigSnapshot] = None) -> str:
         """Get the configuration source for a prompt-include/control entry."""
-        _, source = self._get_entry_enabled_and_source(include)
+        _, source = self._get_entry_enabled_and_source(include, snapshot)
         return source
 
-    def get_prompt_include_config(self, include: str) -> dict:
+    def get_prompt_include_config(self, include: str, snapshot: Optional[ConfigSnapshot] = None) -> dict:
         """Get full prompt-include/control configuration.
 
         Reads security profile 'prompt_includes', then global 'prompt_includes',
         then falls back to system_control_tools for control-tool style entries.
         """
-        config = self.config_store.load()
-        profile_name = self.get_active_profile("security")
+        snapshot = snapshot or self.snapshot()
+        return snapshot.get_prompt_include_config(include)
 
-        security_section = config.get("security_profiles", {}).get(profile_name, {})
-        entry_config = security_section.get("prompt_includes", {}).get(include)
-        if entry_config is None:
-            entry_config = config.get("prompt_includes", {}).get(include)
-        if entry_config is None:
-            entry_config = config.get("system_control_tools", {}).get(include, {})
-
-        return entry_config or {}
-
-    def get_available_prompt_includes_and_controls(self) -> list[str]:
+    def get_available_prompt_includes_and_controls(self, snapshot: Optional[ConfigSnapshot] = None) -> list[str]:
         """Get list of available prompt-includes and system control tools."""
-        config = self.config_store.load()
-        entries: set[str] = set()
-    
-        includes_section = config.get("prompt_includes", {})
-        entries.update(includes_section.keys())
-        entries.update(config.get("system_control_tools", {}).keys())
-        return sorted(entries)
-    
-    def get_enabled_prompt_includes_and_controls(self) -> list[str]:
+        snapshot = snapshot or self.snapshot()
+        return snapshot.get_available_prompt_includes_and_controls()
+
+    def get_enabled_prompt_includes_and_controls(self, snapshot: Optional[ConfigSnapshot] = None) -> list[str]:
         """Get list of enabled prompt-includes and system control tools."""
-        config = self.config_store.load()
-        enabled: list[str] = []
-    
-        includes_section = config.get("prompt_includes", {})
-        for name, cfg in includes_section.items():
-            if cfg.get("enabled", False):
-                enabled.append(name)
-    
-        for name, cfg in config.get("system_control_tools", {}).items():
-            if cfg.get("enabled", False):
-                enabled.append(name)
-    
-        profile = self.get_active_profile("security")
-        if profile:
-            profile_section = config.get("security_profiles", {}).get(profile, {})
-            profile_includes = profile_section.get("prompt_includes", {})
-            for name, cfg in profile_includes.items():
-                if cfg.get("enabled", False):
-                    enabled.append(name)
-        
-        return enabled
+        snapshot = snapshot or self.snapshot()
+        return snapshot.get_enabled_prompt_includes_and_controls()
     
     def set_prompt_include_option(self, name: str, enabled: bool) -> dict:
         """Set a prompt-include/control entry enabled/disabled.
 
         This operates over the global `prompt_includes` and `system_control_tools`
         sections, creating a new entry under `prompt_includes` if it does not
-        yet exist.
+        yet exist. The change is applied as one locked read-modify-write.
         """
-        config = self.config_store.load()
+        return self.config_store.update(
+            lambda snapshot, config: self._apply_prompt_include_option(config, name, enabled)
+        )
 
+    def _apply_prompt_include_option(self, config: dict, name: str, enabled: bool) -> Tuple[bool, dict]:
+        """Apply a prompt-include/control toggle to a mutable config; returns (changed, result)."""
         section = None
         if name in config.get("prompt_includes", {}):
             section = "prompt_includes"
@@ -660,7 +1454,7 @@ class SystemControl:
 
         old_value = config[section][name].get("enabled", False)
         if old_value == enabled:
-            return {
+            return False, {
                 "success": True,
                 "entry": name,
                 "previous_value": old_value,
@@ -670,10 +1464,7 @@ class SystemControl:
 
         config[section][name]["enabled"] = enabled
 
-        if not self.config_store.save(config):
-            return {"success": False, "error": "Failed to write configuration"}
-
-        return {
+        return True, {
             "success": True,
             "entry": name,
             "previous_value": old_value,
@@ -682,34 +1473,183 @@ class SystemControl:
             "note": "Active security profile may still override this setting",
         }
     
-    def is_control_enabled(self, control_name: str) -> bool:
+    def is_control_enabled(self, control_name: str, snapshot: Optional[ConfigSnapshot] = None) -> bool:
         """Check if a control is enabled in the config.
         
         Args:
             control_name: Name of the control to check (e.g., 'workflow_profile_control')
+            snapshot: Optional snapshot to answer from instead of reading the config
         
         Returns:
             bool: True if control is enabled, False otherwise
         """
-        config = self.config_store.load()
-        system_control_tools = config.get("system_control_tools", {})
-        control_config = system_control_tools.get(control_name, {})
-        return control_config.get("enabled", False)
+        snapshot = snapshot or self.snapshot()
+        enabled = snapshot.is_control_enabled(control_name)
+        record_config("control", control_name, enabled)
+        return enabled
     
-    def get_security_state(self) -> dict:
-        """Get full security state for monitoring, including prompt-include/control sources."""
-        config = self.config_store.load()
-        admin_override = self.config_store.has_admin_override()
-        profile_name = self.get_active_profile("security")
+    def get_security_state(self, snapshot: Optional[ConfigSnapshot] = None) -> dict:
+        """Get full security state for monitoring, including prompt-include/control sources.
+
+        Resolved from a single snapshot: one config read and one override check
+        regardless of the number of entries.
+        """
+        snapshot = snapshot or self.snapshot()
 
         entries: dict[str, dict] = {}
-        for name in self.get_available_prompt_includes_and_controls():
-            enabled, source = self._get_entry_enabled_and_source(name)
+        for name in snapshot.get_available_prompt_includes_and_controls():
+            enabled, source = snapshot.get_entry_enabled_and_source(name)
             entries[name] = {"enabled": enabled, "source": source}
 
         return {
-            "active_profile": profile_name,
-            "available_profiles": self.get_available_profiles("security"),
-            "admin_override": admin_override,
+            "active_profile": snapshot.get_active("security"),
+            "available_profiles": self.get_available_profiles("security", snapshot),
+            "admin_override": snapshot.admin_override,
             "entries": entries,
         }
+
+
+# ============================================================================
+# ASYNC FACADE
+# ============================================================================
+
+class AsyncSystemControl:
+    """Non-blocking access to SystemControl for async tools and extensions.
+
+    Offers the SystemControl method surface as coroutines. The facade keeps the
+    current ConfigSnapshot in memory, replaced by config change notifications
+    (inotify or polling, see subscribe()) and dropped after its own writes:
+
+        - Queries (methods taking a snapshot) are answered from the in-memory
+          snapshot on the event loop. A cold or invalidated snapshot, or one
+          older than ASYNC_REVALIDATE_INTERVAL, is revalidated in a worker
+          thread first: the profile index is refreshed there (its stat and
+          listdir calls never run on the loop) and the snapshot is reloaded
+          through its stat-key cache, which is cheap when nothing changed
+        - Writes (set_active_profile, apply, apply_preset, set_prompt_include_option,
+          run_profile_control with action="set_profile") and the remaining
+          blocking calls run in a worker thread via asyncio.to_thread()
+
+    Writes made by other processes become visible with the change notification
+    or the next revalidation, whichever comes first. Use
+    get_async_system_control() to share one facade per config file.
+    """
+
+    WRITE_METHODS = frozenset({"set_active_profile", "apply", "apply_preset", "set_prompt_include_option"})
+
+    def __init__(self, system: Optional[SystemControl] = None):
+        self.system = system or SystemControl()
+        self._snapshot: Optional[ConfigSnapshot] = None
+        # time.monotonic() of the last load or change notification
+        self._validated_at = 0.0
+        # Bumped on every invalidation so a load racing a change is not kept
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._unsubscribe = self.system.subscribe(self._on_config_changed)
+
+    def _on_config_changed(self, sections: Set[str], snapshot: ConfigSnapshot) -> None:
+        """Change notification (watcher thread): the notifier's fresh snapshot becomes current."""
+        with self._lock:
+            self._generation += 1
+            self._snapshot = snapshot
+            self._validated_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Drop the in-memory snapshot; the next query loads a fresh one."""
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+
+    def cached_snapshot(self) -> Optional[ConfigSnapshot]:
+        """The in-memory snapshot, or None when it still has to be loaded."""
+        return self._snapshot
+
+    def _load(self) -> ConfigSnapshot:
+        """Worker thread: refresh the profile index and take a (stat-key cached) snapshot."""
+        self.system.profile_manager.profile_index.refresh()
+        return self.system.snapshot()
+
+    async def snapshot(self) -> ConfigSnapshot:
+        """Return the in-memory snapshot, revalidating it in a worker thread when cold or stale."""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._validated_at < ASYNC_REVALIDATE_INTERVAL:
+            return snapshot
+        generation = self._generation
+        snapshot = await asyncio.to_thread(self._load)
+        with self._lock:
+            if self._generation == generation:
+                self._snapshot = snapshot
+                self._validated_at = time.monotonic()
+        return snapshot
+
+    async def _write(self, method: Callable, *args, **kwargs):
+        try:
+            return await asyncio.to_thread(method, *args, **kwargs)
+        finally:
+            self.invalidate()
+
+    def __getattr__(self, name: str):
+        """Wrap a SystemControl method as a coroutine function (built once per name)."""
+        method = getattr(self.system, name)
+        if name.startswith("_") or not callable(method):
+            return method
+
+        signature = inspect.signature(method)
+        if name in self.WRITE_METHODS:
+            async def wrapper(*args, **kwargs):
+                return await self._write(method, *args, **kwargs)
+        elif "snapshot" not in signature.parameters:
+            async def wrapper(*args, **kwargs):
+                return await asyncio.to_thread(method, *args, **kwargs)
+        else:
+            async def wrapper(*args, **kwargs):
+                bound = signature.bind_partial(*args, **kwargs)
+                if name == "run_profile_control" and bound.arguments.get("action") == "set_profile":
+                    return await self._write(method, *args, **kwargs)
+                # Also revalidates the profile index, so the lookups below need no stats
+                snapshot = await self.snapshot()
+                if bound.arguments.get("snapshot") is None:
+                    bound.arguments["snapshot"] = snapshot
+                with revalidation_skipped():
+                    return method(*bound.args, **bound.kwargs)
+
+        wrapper.__name__ = name
+        wrapper.__doc__ = method.__doc__
+        self.__dict__[name] = wrapper
+        return wrapper
+
+
+def get_system_control() -> SystemControl:
+    """Return a process-wide SystemControl for the current control environment.
+
+    For hot paths (cache validation, budget lookups) that would otherwise build
+    a SystemControl, and with the SQLite backend a connection, per call.
+    """
+    key = tuple(
+        os.environ.get(name)
+        for name in (
+            "SYSTEM_CONTROL_FILE",
+            "SYSTEM_CONTROL_OVERRIDE",
+            "SYSTEM_CONTROL_BACKEND",
+            "SYSTEM_CONTROL_DB",
+            "SYSTEM_CONTROL_SCOPE",
+        )
+    )
+    with _SYSTEMS_LOCK:
+        system = _SYSTEMS.get(key)
+        if system is None:
+            system = SystemControl()
+            _SYSTEMS[key] = system
+        return system
+
+
+def get_async_system_control() -> AsyncSystemControl:
+    """Return the process-wide AsyncSystemControl for the configured control files."""
+    system = SystemControl()
+    key = (system.config_store.config_path, system.config_store.admin_override_path)
+    with _ASYNC_FACADES_LOCK:
+        facade = _ASYNC_FACADES.get(key)
+        if facade is None:
+            facade = AsyncSystemControl(system)
+            _ASYNC_FACADES[key] = facade
+        return facade
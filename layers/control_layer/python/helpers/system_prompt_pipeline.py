@@ -0,0 +1,138 @@
+"""System prompt pipeline - Manifest-driven insertion of control layer prompt segments
+
+Replaces the per-segment system_prompt extensions (pre/post system manual,
+pre/post behaviour, model godmode, system_ready) with one pass driven by
+control_layer/prompts/system_prompt_pipeline.json. Each manifest entry has:
+
+    - "source": segment name (used for prompt budgets, ordering and caching)
+    - "position": index among the framework prompt parts present when the
+      pipeline runs to insert before, or "end" to append; entries with the same
+      position keep manifest order
+    - "file": prompt file, "{profile}" is replaced by the agent profile
+    - "required": when the file is missing, required entries insert a
+      "# File Skipped" notice followed by "fallback" (default "(placeholder)");
+      optional entries are left out
+    - "fallback": text used with the notice for a missing required file
+
+Each file is read with agent.read_prompt() inside a segment_cache segment: the
+file, every file it includes and the config lookups and files of the plugins
+it renders are recorded, so an unchanged segment is reused without re-reading
+and its existence check is the stat that validates the cache entry. Budget
+ledger entries recorded while rendering are cached with the segment and
+replayed on reuse. Segment budgets are applied to the result every turn.
+
+One config snapshot is taken per build: segment validation and every budget
+lookup of the build (see prompt_budget.begin_build) use it.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from python.helpers import files
+from python.helpers.print_style import PrintStyle
+from control_layer.python.helpers import prompt_budget, prompt_templates, segment_cache
+from control_layer.python.helpers.file_watcher import stat_key
+
+
+# control_layer/python/helpers/system_prompt_pipeline.py -> control_layer/prompts/system_prompt_pipeline.json
+PIPELINE_MANIFEST = str(Path(__file__).resolve().parents[2] / "prompts" / "system_prompt_pipeline.json")
+
+# Parsed manifests: path -> (stat key, segment entries)
+_MANIFEST_CACHE: Dict[str, Tuple[Optional[tuple], List[dict]]] = {}
+
+
+def load_manifest(path: str = PIPELINE_MANIFEST) -> List[dict]:
+    """Return the manifest's segment entries, re-reading the file only when it changed."""
+    key = stat_key(path)
+    cached = _MANIFEST_CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    try:
+        with open(path, "r", encoding="utf-8") as manifest_file:
+            segments = json.load(manifest_file).get("segments", [])
+    except Exception as e:
+        PrintStyle().error(f"❌ System prompt pipeline could not load {path}: {e}")
+        segments = []
+
+    entries = []
+    for entry in segments:
+        if not isinstance(entry, dict) or not entry.get("source") or not entry.get("file"):
+            PrintStyle().warning(f"⚠️ System prompt pipeline ignoring entry without source/file: {entry}")
+            continue
+        position = entry.get("position", "end")
+        if position != "end" and not isinstance(position, int):
+            PrintStyle().warning(f"⚠️ System prompt pipeline: invalid position {position!r} for {entry['source']}, appending")
+            entry["position"] = "end"
+        entries.append(entry)
+    _MANIFEST_CACHE[path] = (key, entries)
+    return entries
+
+
+def _prompt_directories(agent: Any) -> List[str]:
+    """Search directories agent.read_prompt() uses (agent profile prompts, then prompts)."""
+    directories = [files.get_abs_path("prompts")]
+    if agent.config.profile:
+        directories.insert(0, files.get_abs_path("agents", agent.config.profile, "prompts"))
+    return directories
+
+
+def _read_segment(agent: Any, source: str, prompt_file: str, snapshot: Any = None) -> Optional[str]:
+    """Render prompt_file for agent through the segment cache; None if the file is missing."""
+
+    def compute() -> dict:
+        if not files.exists(prompt_file):
+            segment_cache.record_file(files.get_abs_path(prompt_file))
+            return {"text": None, "ledger": {}}
+        ledger = prompt_budget.get_ledger(agent)
+        before = dict(ledger)
+        prompt_templates.record_include_tree(files.get_abs_path(prompt_file), _prompt_directories(agent))
+        # Pass agent object for plugin/template access
+        text = agent.read_prompt(prompt_file, agent=agent)
+        recorded = {name: entry for name, entry in ledger.items() if before.get(name) is not entry}
+        return {"text": text, "ledger": recorded}
+
+    inputs = {"file": prompt_file}
+    inputs.update(segment_cache.agent_inputs(agent))
+    result = segment_cache.cached_segment(f"system_prompt:{source}", inputs, compute, snapshot)
+    prompt_budget.get_ledger(agent).update(result["ledger"])
+    return result["text"]
+
+
+def build_segments(agent: Any) -> List[Tuple[Any, str]]:
+    """Return (position, padded segment) for every manifest entry that produced text."""
+    from control_layer.python.helpers.system_control import get_system_control
+    snapshot = get_system_control().snapshot()
+    prompt_budget.begin_build(agent, snapshot)
+    agent_profile = agent.config.profile or "default"
+    segments = []
+    for entry in load_manifest():
+        source = entry["source"]
+        prompt_file = entry["file"].replace("{profile}", agent_profile)
+        prompt = _read_segment(agent, source, prompt_file, snapshot)
+        if prompt is None:
+            if not entry.get("required", True):
+                continue
+            prompt = '# File Skipped: ' + prompt_file
+            prompt = prompt + '\n\n' + entry.get("fallback", "(placeholder)")
+        prompt_padded = prompt_budget.budgeted_segment(agent, source, prompt)
+        if prompt_padded:
+            segments.append((entry.get("position", "end"), prompt_padded))
+    return segments
+
+
+def run_pipeline(agent: Any, system_prompt: List[str]) -> None:
+    """Insert all pipeline segments into system_prompt in one operation."""
+    segments = build_segments(agent)
+    framework_parts = list(system_prompt)
+    slots: List[List[str]] = [[] for _ in range(len(framework_parts) + 1)]
+    for position, prompt_padded in segments:
+        index = len(framework_parts) if position == "end" else min(max(position, 0), len(framework_parts))
+        slots[index].append(prompt_padded)
+
+    assembled: List[str] = []
+    for index, part in enumerate(framework_parts):
+        assembled.extend(slots[index])
+        assembled.append(part)
+    assembled.extend(slots[-1])
+    system_prompt[:] = assembled